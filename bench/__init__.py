@@ -0,0 +1 @@
+"""Benchmarks das páginas do painel com dados sintéticos (ver ``bench.executar``)."""
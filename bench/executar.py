@@ -0,0 +1,160 @@
+"""Mede, sem Streamlit, cada etapa das duas páginas sobre dados sintéticos.
+
+Para cada tamanho pedido gera as contas (``bench.gerador``), grava o
+armazenamento mensal num diretório temporário e cronometra a carga, os filtros
+e cada quadro das páginas com os filtros padrão (todas as empresas, último mês
+dos dados). O resultado vai para ``bench/resultados/<linhas>-<data>.json``
+para comparar versões.
+
+Uso: ``python -m bench.executar 100000 1000000 10000000 --repeticoes 5``
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bench import gerador
+from painel import comparativo, relatorios, schema, sync, tabelas
+from painel.cubo import Cubo
+from painel.formatacao import formatar_tabela, moeda, percentual
+from painel.indice import IndiceFiltro
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+
+def _cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return resultado, tempos
+
+
+def _cards(contexto, selecoes, vendas):
+    resultado = relatorios.cards(contexto, selecoes, vendas)
+    resumo = resultado["resumo"]
+    return moeda(resumo["ticket_medio"]), formatar_tabela(resultado["subcategorias"], moeda)
+
+
+def _pivots_diarios(vendas):
+    resultado = relatorios.realizado_por_dia(vendas)
+    # O que a página entrega ao st.dataframe: tabela numérica, formatos e estilo
+    return [
+        (
+            tabelas.formatar(tabelas.estilo_totais(tabelas.sem_zeros(tabela)), formato),
+            tabelas.configuracao(tabela, formato),
+        )
+        for tabela, formato in [(resultado["realizado_qtd"], "milhar"), (resultado["realizado_valor"], "moeda")]
+    ]
+
+
+def _metas(contexto, selecoes, vendas):
+    resultado = relatorios.metas_x_realizado(contexto, selecoes, vendas)
+    return [
+        (
+            tabelas.formatar(
+                tabelas.estilo_limiar(tabelas.sem_zeros(tabela), comparativo.colunas_percentuais(tabela)),
+                comparativo.formato,
+            ),
+            tabelas.configuracao(tabela, comparativo.formato),
+        )
+        for tabela in resultado["comparativo"].values()
+    ]
+
+
+def _resumo_categorias(vendas):
+    resumo = relatorios.resumo_categorias(vendas)
+    return moeda(resumo["Total"]), percentual(resumo["% Part"])
+
+
+def _pivots_categorias(vendas):
+    return [(tabelas.formatar(tabela.style, "milhar"), tabelas.configuracao(tabela, "milhar")) for tabela in relatorios.pivots_categorias(vendas).values()]
+
+
+def medir(linhas, repeticoes=3, semente=42):
+    """Tempos (segundos) de cada etapa para ``linhas`` linhas sintéticas."""
+    contas = gerador.gerar_contas(linhas, semente=semente)
+    metas = gerador.gerar_metas(contas, semente=semente)
+    fim = contas["Data"].max()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        sync.DIRETORIO_STORE = diretorio
+        gerador.gravar_store(contas, diretorio)
+        del contas
+        etapas = {}
+
+        def etapa(nome, funcao, vezes=repeticoes):
+            resultado, tempos = _cronometrar(funcao, vezes)
+            etapas[nome] = {"mediana_s": statistics.median(tempos), "min_s": min(tempos), "tempos_s": tempos}
+            return resultado
+
+        data = etapa("carga", lambda: schema.normalizar(sync.ler_store()), vezes=1)
+
+    cubo = etapa("cubo", lambda: Cubo(data), vezes=1)
+    indice = etapa("indice", lambda: IndiceFiltro(data, relatorios.COLUNAS_FILTRO), vezes=1)
+    contexto = relatorios.Contexto(data, cubo, indice, metas, IndiceFiltro(metas, relatorios.COLUNAS_FILTRO_METAS))
+
+    # Filtros padrão das páginas: todas as empresas no último mês dos dados
+    selecoes = {"Empresa": None, "Ano": [fim.year], "Mes": [fim.month], "Dia": None}
+    vendas, linhas_filtradas = etapa("filtros", lambda: (cubo.filtrar(selecoes), indice.filtrar(data, selecoes)))
+
+    etapa("parceiros.cards", lambda: _cards(contexto, selecoes, vendas))
+    etapa("parceiros.pivots_diarios", lambda: _pivots_diarios(vendas))
+    etapa("parceiros.metas", lambda: _metas(contexto, selecoes, vendas))
+    etapa("categorias.resumo", lambda: _resumo_categorias(vendas))
+    etapa("categorias.pivots", lambda: _pivots_categorias(vendas))
+    etapa("categorias.graficos", lambda: relatorios.graficos_categorias(vendas))
+    return {
+        "linhas": linhas,
+        "linhas_filtradas": len(linhas_filtradas),
+        "linhas_cubo": len(cubo.tabela),
+        "etapas": etapas,
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("linhas", type=int, nargs="*", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", default=DIRETORIO_RESULTADOS)
+    args = parser.parse_args()
+
+    os.makedirs(args.saida, exist_ok=True)
+    for linhas in args.linhas:
+        resultado = medir(linhas, args.repeticoes)
+        resultado.update({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        })
+        destino = os.path.join(args.saida, f"{linhas}-{datetime.now():%Y%m%d-%H%M%S}.json")
+        with open(destino, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=1)
+        print(f"{linhas:>10} linhas -> {destino}")
+        for nome, tempos in resultado["etapas"].items():
+            print(f"    {nome:<28} {tempos['mediana_s'] * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Gerador de dados sintéticos no formato de /contas e das metas diárias.
+
+As contas têm uma empresa e um dia; a primeira linha de cada conta é sempre de
+uma categoria principal e as demais misturam principais e secundárias, como no
+movimento real. Tudo é gerado com numpy em blocos, então 10M de linhas cabem
+em poucos segundos.
+
+Uso: ``python -m bench.gerador 1000000 --saida /tmp/contas`` grava o
+armazenamento mensal em Parquet (o mesmo de ``painel.sync``) e as metas.
+"""
+import argparse
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from painel.relatorios import PRINCIPAIS, SECUNDARIAS
+from painel.schema import MESES
+
+CATEGORIAS = PRINCIPAIS + SECUNDARIAS
+N_EMPRESAS = 12
+ANOS = 3
+# Linhas por conta: 1 a 7, mais frequentes as contas pequenas
+LINHAS_POR_CONTA = np.array([0.30, 0.25, 0.18, 0.12, 0.08, 0.05, 0.02])
+
+
+def empresas(n=N_EMPRESAS):
+    return [f"Empresa {i:02d}" for i in range(1, n + 1)]
+
+
+def gerar_contas(linhas, anos=ANOS, n_empresas=N_EMPRESAS, semente=42, fim=None):
+    """DataFrame com ``linhas`` linhas de /contas cobrindo ``anos`` anos até ``fim``."""
+    rng = np.random.default_rng(semente)
+    fim = pd.Timestamp(fim or date.today())
+    dias = pd.date_range(fim - pd.DateOffset(years=anos) + pd.Timedelta(days=1), fim, freq="D")
+
+    # Contas suficientes para cobrir as linhas; o excesso é cortado no fim
+    tamanhos = rng.choice(len(LINHAS_POR_CONTA), size=linhas, p=LINHAS_POR_CONTA) + 1
+    tamanhos = tamanhos[: np.searchsorted(np.cumsum(tamanhos), linhas) + 1]
+    n_contas = len(tamanhos)
+    conta = np.repeat(np.arange(n_contas), tamanhos)[:linhas]
+    primeira = np.r_[True, conta[1:] != conta[:-1]]
+
+    # Empresa e dia são da conta; o volume cresce um pouco ao longo dos anos
+    peso_dia = np.linspace(0.7, 1.3, len(dias))
+    dia_conta = rng.choice(len(dias), size=n_contas, p=peso_dia / peso_dia.sum())
+    empresa_conta = rng.integers(0, n_empresas, size=n_contas)
+    datas = dias[dia_conta[conta]]
+
+    principal = rng.choice(len(PRINCIPAIS), size=linhas, p=[0.45, 0.25, 0.15, 0.15])
+    secundaria = len(PRINCIPAIS) + rng.choice(len(SECUNDARIAS), size=linhas, p=[0.45, 0.1, 0.25, 0.2])
+    categoria = np.where(primeira | (rng.random(linhas) < 0.35), principal, secundaria)
+
+    qtd = rng.integers(1, 7, size=linhas)
+    preco = np.where(categoria < len(PRINCIPAIS), rng.uniform(60, 140, linhas), rng.uniform(8, 45, linhas))
+    total = np.round(qtd * preco, 2)
+    servico = np.round(np.where(rng.random(linhas) < 0.7, total * 0.1, 0.0), 2)
+
+    return pd.DataFrame({
+        "conta": (conta + 1000).astype(str),
+        "Empresa": pd.Categorical.from_codes(empresa_conta[conta], empresas(n_empresas)),
+        "Categoria": pd.Categorical.from_codes(categoria, CATEGORIAS),
+        "Ano": datas.year.astype("int64"),
+        "Mes": datas.month.astype("int64"),
+        "Dia": datas.day.astype("int64"),
+        "Data": datas,
+        "QTD": qtd.astype("float64"),
+        "TotalLiq": total,
+        "servico": servico,
+    })
+
+
+def gerar_metas(contas, semente=42):
+    """Metas diárias (colunas da planilha) por empresa e categoria principal, sem domingos."""
+    rng = np.random.default_rng(semente)
+    dias = pd.DataFrame({"Data": pd.to_datetime(contas["Data"].unique())})
+    dias = dias[dias["Data"].dt.dayofweek != 6]
+    grade = dias.merge(
+        pd.DataFrame({"Empresa": empresas(contas["Empresa"].nunique())}), how="cross"
+    ).merge(pd.DataFrame({"Categoria": PRINCIPAIS}), how="cross")
+    return pd.DataFrame({
+        "Empresa": grade["Empresa"],
+        "Categoria": grade["Categoria"],
+        "Mês": grade["Data"].dt.month.map(MESES),
+        "Dia": grade["Data"].dt.day,
+        "Meta_Diária": rng.integers(5, 60, size=len(grade)),
+        "Ano": grade["Data"].dt.year,
+    })
+
+
+def gravar_store(contas, diretorio):
+    """Grava ``contas`` no layout de ``painel.sync`` (um Parquet por mês) em ``diretorio``."""
+    os.makedirs(diretorio, exist_ok=True)
+    tabela = contas.astype({"conta": str, "Empresa": str, "Categoria": str})
+    for (ano, mes), parte in tabela.groupby(["Ano", "Mes"], sort=True):
+        parte.to_parquet(os.path.join(diretorio, f"{ano:04d}-{mes:02d}.parquet"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("linhas", type=int)
+    parser.add_argument("--saida", required=True, help="diretório de dados (como PAINEL_DADOS)")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+    contas = gerar_contas(args.linhas, semente=args.semente)
+    gravar_store(contas, os.path.join(args.saida, "contas"))
+    gerar_metas(contas, semente=args.semente).to_excel(os.path.join(args.saida, "metas.xlsx"), index=False, sheet_name="Sheet1")
+    print(f"{len(contas)} linhas gravadas em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Servidor local que imita o /contas do backend em todos os formatos do cliente.
+
+Serve contas sintéticas (``bench.gerador``) ou um armazenamento Parquet já
+gravado, negociando o formato pelo ``Accept`` (Arrow IPC, Parquet ou JSON) e a
+compressão pelo ``Accept-Encoding`` (zstd, gzip ou nenhuma), como o backend
+deve fazer. ``?formato=`` e ``?compressao=`` forçam uma combinação. Os filtros da
+sincronização também são atendidos: ``desde`` (incremental) e ``ano``/``mes``
+(partições mensais).
+
+Uso: ``python -m bench.servidor_stub --linhas 1000000 --porta 5005`` e depois
+``PAINEL_URL_BASE=http://127.0.0.1:5005 streamlit run Parceiros.py`` (ou
+``api.URL_BASE`` no mesmo processo).
+"""
+import argparse
+import gzip
+import io
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bench import gerador
+from painel import ingestao, sync
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FORMATOS = {"arrow": ingestao.TIPO_ARROW, "parquet": ingestao.TIPO_PARQUET, "json": ingestao.TIPO_JSON}
+COMPRESSOES = ["zstd", "gzip", "identity"]
+
+
+def _preferencias(cabecalho):
+    # "a, b;q=0.9" -> {"a": 1.0, "b": 0.9}
+    pesos = {}
+    for parte in (cabecalho or "").split(","):
+        nome, *opcoes = [pedaco.strip() for pedaco in parte.split(";")]
+        if not nome:
+            continue
+        peso = 1.0
+        for opcao in opcoes:
+            if opcao.startswith("q="):
+                peso = float(opcao[2:])
+        pesos[nome.lower()] = peso
+    return pesos
+
+
+def negociar_formato(accept):
+    """Formato preferido pelo ``Accept`` entre os servidos (JSON se nenhum casar)."""
+    pesos = _preferencias(accept)
+    candidatos = [(pesos.get(tipo, 0.0), -posicao, nome) for posicao, (nome, tipo) in enumerate(FORMATOS.items())]
+    peso, _, nome = max(candidatos)
+    return nome if peso > 0 else "json"
+
+
+def negociar_compressao(accept_encoding):
+    """Compressão preferida pelo ``Accept-Encoding`` (zstd só se o zstandard estiver instalado)."""
+    pesos = _preferencias(accept_encoding)
+    for nome in COMPRESSOES[:-1]:
+        if pesos.get(nome, 0.0) > 0 and (nome != "zstd" or zstandard is not None):
+            return nome
+    return "identity"
+
+
+def codificar(contas, formato):
+    """Corpo de /contas em ``formato`` (Data em texto no JSON, como o backend Flask)."""
+    if formato == "json":
+        texto = contas.assign(Data=contas["Data"].dt.strftime("%a, %d %b %Y %H:%M:%S GMT"))
+        return texto.to_json(orient="records", force_ascii=False).encode("utf-8")
+    tabela = pa.Table.from_pandas(
+        contas.astype({"conta": str, "Empresa": str, "Categoria": str}), preserve_index=False,
+    )
+    destino = io.BytesIO()
+    if formato == "parquet":
+        pq.write_table(tabela, destino)
+    else:
+        with pa.ipc.new_stream(destino, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+    return destino.getvalue()
+
+
+def comprimir(corpo, compressao):
+    if compressao == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(corpo)
+    if compressao == "gzip":
+        return gzip.compress(corpo, compresslevel=6)
+    return corpo
+
+
+class Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, contas, porta=0):
+        super().__init__(("127.0.0.1", porta), _Tratador)
+        self.contas = contas
+        self.requisicoes = 0
+        # Os corpos se repetem entre requisições (benchmarks): guarda os últimos prontos
+        self.corpo = lru_cache(maxsize=16)(self._corpo)
+
+    def _corpo(self, desde, ano, mes, formato, compressao):
+        contas = self.contas
+        if desde:
+            contas = contas[contas["Data"] >= pd.Timestamp(desde)]
+        if ano:
+            contas = contas[contas["Data"].dt.year == int(ano)]
+        if mes:
+            contas = contas[contas["Data"].dt.month == int(mes)]
+        return comprimir(codificar(contas, formato), compressao)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _Tratador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        endereco = urlparse(self.path)
+        if endereco.path != "/contas":
+            self.send_error(404)
+            return
+        params = {nome: valores[0] for nome, valores in parse_qs(endereco.query).items()}
+        formato = params.get("formato") or negociar_formato(self.headers.get("Accept"))
+        compressao = params.get("compressao") or negociar_compressao(self.headers.get("Accept-Encoding"))
+        corpo = self.server.corpo(
+            params.get("desde"), params.get("ano"), params.get("mes"), formato, compressao,
+        )
+        self.server.requisicoes += 1
+
+        self.send_response(200)
+        self.send_header("Content-Type", FORMATOS[formato])
+        if compressao != "identity":
+            self.send_header("Content-Encoding", compressao)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def iniciar(contas, porta=0):
+    """Sobe o servidor numa thread e o devolve (``.url``, ``.shutdown()``)."""
+    servidor = Servidor(contas, porta)
+    threading.Thread(target=servidor.serve_forever, name="servidor-stub", daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--linhas", type=int, help="gera essa quantidade de contas sintéticas")
+    origem.add_argument("--store", help="diretório de Parquet mensal (como o de painel.sync)")
+    parser.add_argument("--porta", type=int, default=5005)
+    args = parser.parse_args()
+    if args.store:
+        sync.DIRETORIO_STORE = args.store
+        contas = sync.ler_store()
+    else:
+        contas = gerador.gerar_contas(args.linhas)
+    servidor = Servidor(contas, args.porta)
+    print(f"{len(contas)} contas em {servidor.url}/contas")
+    servidor.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compara os formatos de transporte de /contas contra o servidor local.
+
+Para cada combinação de formato (Arrow IPC, Parquet, JSON) e compressão (zstd,
+gzip, nenhuma) mede o tempo de ``painel.sync``/``painel.api`` buscando e lendo
+o corpo inteiro e os bytes que passaram pela rede, e confere que o DataFrame
+lido é o mesmo do JSON.
+
+Uso: ``python -m bench.transporte 1000000``
+"""
+import argparse
+import statistics
+import time
+
+import pandas as pd
+
+from bench import gerador, servidor_stub
+from painel import api, ingestao, metricas
+
+
+def _ler(formato, compressao):
+    """DataFrame lido e bytes recebidos (medição de ``painel.api``) de uma combinação."""
+    execucao = metricas.Execucao("transporte")
+    # Parâmetros forçam a combinação; cabeçalhos iguais aos da sincronização
+    contas = api.buscar(
+        "/contas", {"formato": formato, "compressao": compressao},
+        ler=ingestao.ler_resposta, stream=True, headers=ingestao.cabecalhos(),
+    )
+    recebidos = next(medicao["bytes"] for medicao in execucao.fim() if medicao["secao"] == "api /contas")
+    return contas, recebidos
+
+
+def medir(linhas, repeticoes=3):
+    """{(formato, compressao): {"mediana_s", "bytes"}} para ``linhas`` contas sintéticas."""
+    servidor = servidor_stub.iniciar(gerador.gerar_contas(linhas))
+    api.URL_BASE = servidor.url
+    compressoes = [nome for nome in servidor_stub.COMPRESSOES if nome != "zstd" or servidor_stub.zstandard]
+    referencia = None
+    resultados = {}
+    try:
+        for formato in ["json", "parquet", "arrow"]:
+            for compressao in compressoes:
+                _ler(formato, compressao)  # aquece o corpo no servidor
+                tempos = []
+                for _ in range(repeticoes):
+                    inicio = time.perf_counter()
+                    contas, recebidos = _ler(formato, compressao)
+                    tempos.append(time.perf_counter() - inicio)
+                if referencia is None:
+                    referencia = contas
+                pd.testing.assert_frame_equal(
+                    contas.astype({nome: str for nome in ingestao.COLUNAS_CATEGORICAS}),
+                    referencia.astype({nome: str for nome in ingestao.COLUNAS_CATEGORICAS}),
+                )
+                resultados[(formato, compressao)] = {
+                    "mediana_s": statistics.median(tempos),
+                    "bytes": recebidos,
+                }
+    finally:
+        servidor.shutdown()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("linhas", type=int)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+    for (formato, compressao), valores in medir(args.linhas, args.repeticoes).items():
+        print(f"{formato:<8} {compressao:<9} {valores['mediana_s'] * 1000:9.1f} ms  {valores['bytes'] / 2**20:9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
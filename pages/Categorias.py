@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
-import requests
 from datetime import datetime
 from st_aggrid import AgGrid, GridOptionsBuilder
 import plotly.express as px
+from painel import detalhe, graficos, metricas, relatorios, tabelas
+from painel.dados import anos, comparacao, garantir, get_data, mostrar_idade, mostrar_metricas, relatorio
+from painel.formatacao import milhar, moeda, percentual, valor
+from painel.indice import selecao
+from painel.schema import MESES, numeros_meses
 
 # ------------------------------------------------------------------------------
 # Configurações iniciais e estilo
@@ -15,15 +19,6 @@ st.set_page_config(
 
 paleta_roxos = ["#D6C2E9", "#CAB0EA", "#8A4CCC", "#5D3A7A", "#4A306D"]
 
-def formata_brasil(x):
-    # Se x não for numérico, apenas retorna como string
-    if pd.isnull(x):
-        return "0"
-    # Garante inteiro (ou arredonda)
-    val_int = int(round(x))
-    # Formata com vírgula como separador de milhar e depois troca "," por "."
-    return f"{val_int:,}".replace(",", ".")
-
 # CSS para deixar o visual coerente com a primeira página
 st.markdown("""
     <style>
@@ -54,171 +49,38 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# ------------------------------------------------------------------------------
-# Título principal
-# ------------------------------------------------------------------------------
-st.markdown("<h1 style='font-size: 32px; color: #5D3A7A'>📊 Dashboard Vendas por Categoria</h1>", unsafe_allow_html=True)
-
-# ------------------------------------------------------------------------------
-# Função para buscar dados da API com cache
-# ------------------------------------------------------------------------------
-if "dados" not in st.session_state:
-    @st.cache_data
-    def get_data():
-        url = "http://192.168.10.11:5005/contas"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return pd.DataFrame(data)
-        except requests.exceptions.RequestException as e:
-            st.error(f"❌ Erro ao buscar os dados: {e}")
-            return pd.DataFrame()
+# Tempos por seção desta execução (painel.metricas)
+execucao = metricas.Execucao("categorias")
 
-# ------------------------------------------------------------------------------
-# Carregar os dados (usa sessão ou função)
-# ------------------------------------------------------------------------------
-if "dados" in st.session_state:
-    data = st.session_state['dados']
-else:
-    data = get_data()
 
 # ------------------------------------------------------------------------------
-# Se dados estiverem disponíveis, processa
+# Seções da página: cada uma calcula só os quadros dela (painel.relatorios.SECOES)
 # ------------------------------------------------------------------------------
-if not data.empty:
-    # Conversão de colunas para evitar erros
-    data['conta'] = data['conta'].astype(str)
-    data['Ano'] = data['Ano'].astype(str)
-    data['Mes'] = data['Mes'].astype(int)
-    data['Dia'] = data['Dia'].astype(str)
-    data['TotalLiq'] = data['TotalLiq'].astype(float)
-
-    # Mapeamento de número do mês para nome
-    meses_nomes = {
-        1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
-        5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
-        9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
-    }
-    data["Mes_Nome"] = data["Mes"].map(meses_nomes)
-
-    # Ano e mês atuais (para usar como default)
-    ano_atual = str(datetime.now().year)
-    mes_atual = meses_nomes[datetime.now().month]
-
-    # Opções para filtros (com "Todos" incluído)
-    opcoes_empresa = ["Todos"] + sorted(data["Empresa"].unique())
-    opcoes_ano = ["Todos"] + sorted(data["Ano"].unique())
-    opcoes_mes = ["Todos"] + list(meses_nomes.values())  # Usa todos os nomes de mês
-    opcoes_categoria = ["Todos"] + sorted(data["Categoria"].unique())
-
-    # ------------------------------------------------------------------------------
-    # SIDEBAR - Filtros
-    # ------------------------------------------------------------------------------
-    empresas_selecionadas = st.sidebar.multiselect(
-        "Empresa", 
-        options=opcoes_empresa, 
-        default=["Todos"]
-    )
-    anos_selecionados = st.sidebar.multiselect(
-        "Ano", 
-        options=opcoes_ano, 
-        default=[ano_atual]
-    )
-    meses_selecionados = st.sidebar.multiselect(
-        "Mês", 
-        options=opcoes_mes, 
-        default=[mes_atual]
-    )
-    categorias_selecionadas = st.sidebar.multiselect(
-        "Categoria", 
-        options=opcoes_categoria, 
-        default=["Todos"]
-    )
-
-    # ------------------------------------------------------------------------------
-    # Aplicando filtros
-    # ------------------------------------------------------------------------------
-    df_filtrado = data.copy()
-    
-    df_filtrado["Dia"] = pd.to_numeric(df_filtrado["Dia"], errors="coerce")
-
-    if "Todos" not in empresas_selecionadas:
-        df_filtrado = df_filtrado[df_filtrado["Empresa"].isin(empresas_selecionadas)]
-
-    if "Todos" not in anos_selecionados:
-        df_filtrado = df_filtrado[df_filtrado["Ano"].isin(anos_selecionados)]
-
-    if "Todos" not in meses_selecionados:
-        df_filtrado = df_filtrado[df_filtrado["Mes_Nome"].isin(meses_selecionados)]
-
-    if "Todos" not in categorias_selecionadas:
-        df_filtrado = df_filtrado[df_filtrado["Categoria"].isin(categorias_selecionadas)]
-
-    # ------------------------------------------------------------------------------
-    # MÉTRICAS PRINCIPAIS
-    # ------------------------------------------------------------------------------
-    total_geral = df_filtrado["TotalLiq"].sum()
-    total_servicos = df_filtrado["servico"].sum()
-
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown(f"""
-        <div class="info-card" style="background-color: #D6C2E9; color: #5D3A7A; text-align: 'center'">
-            <h3>💰 Total Geral</h3>
-            <h2>R$ {formata_brasil(total_geral)}</h2>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="info-card" style="background-color: #D6C2E9; color: #5D3A7A">
-            <h3>🛠️ Total de Serviços</h3>
-            <h2>R$ {formata_brasil(total_servicos)}</h2>
-        </div>
-        """, unsafe_allow_html=True)
+def secao_resumo(data, selecoes, modo):
+    # Totais por categoria com a linha de total, ainda numéricos; comparando
+    # períodos, com o Total anterior e a variação de cada categoria
+    if modo is None:
+        df_categorias = relatorio("categorias", data, selecoes, secao="resumo")["resumo"]
+    else:
+        df_categorias = comparacao(data, selecoes, modo)["resumo"]
 
-    # ------------------------------------------------------------------------------
-    # TABELA DE RESUMO POR CATEGORIA
-    # ------------------------------------------------------------------------------
-    st.markdown("---")
     st.markdown("<h1 style='color: #5D3A7A; font-size: 32px; text-align: center; margin-top: 30px;'>📋 Resumo por Categoria</h1>", unsafe_allow_html=True)
 
-    df_categorias = df_filtrado.groupby("Categoria").agg(
-        Quantidade=("QTD", "sum"),
-        Total=("TotalLiq", "sum")
-    ).reset_index()
-
-    # Adicionar coluna de participação no total (%)
-    if df_categorias["Total"].sum() > 0:
-        df_categorias["% Part"] = (df_categorias["Total"] / df_categorias["Total"].sum()) * 100
-    else:
-        df_categorias["% Part"] = 0
-
-    # Formatação de valores
-    df_categorias["Total"] = df_categorias["Total"].apply(lambda x: f'R$ {x:,.2f}')
-    df_categorias["% Part"] = df_categorias["% Part"].apply(lambda x: f'{x:.2f}%')
-
-    # Linha de total
-    total_sum = (
-        df_categorias["Total"]
-        .replace('[R$ ,]', '', regex=True)
-        .astype(float)
-        .sum()
+    # Formatação de valores (coluna inteira de uma vez); o numérico fica para o gráfico
+    df_categorias = df_categorias.assign(
+        Total_num=df_categorias["Total"],
+        Total=moeda(df_categorias["Total"]),
+        **{"% Part": percentual(df_categorias["% Part"])},
     )
-
-    total_row = pd.DataFrame({
-        "Categoria": ["Total"],
-        "Quantidade": [df_categorias["Quantidade"].sum()],
-        "Total": [f'R$ {total_sum:,.2f}'],
-        "% Part": ["100.00%"]
-    })
-
-    # Concatena o totalizador
-    df_categorias = pd.concat([df_categorias, total_row], ignore_index=True)
+    if modo is not None:
+        df_categorias = df_categorias.assign(**{
+            "Total anterior": moeda(df_categorias["Total anterior"]),
+            "Δ %": percentual(df_categorias["Δ %"], casas=1, vazio="-"),
+        })
+    df_categorias_grid = df_categorias.drop(columns="Total_num")
 
     # Configuração AgGrid
-    gb = GridOptionsBuilder.from_dataframe(df_categorias)
+    gb = GridOptionsBuilder.from_dataframe(df_categorias_grid)
     gb.configure_default_column(
         resizable=True,
         auto_size=True,
@@ -238,7 +100,7 @@ if not data.empty:
     }
 
     AgGrid(
-        df_categorias,
+        df_categorias_grid,
         gridOptions=gb.build(),
         theme="balham",
         height=400,
@@ -246,16 +108,8 @@ if not data.empty:
         custom_css=custom_css
     )
 
-    # ------------------------------------------------------------------------------
-    # GRÁFICO DE BARRAS - FATURAMENTO POR CATEGORIA
-    # ------------------------------------------------------------------------------
+    # Gráfico de barras - faturamento por categoria
     st.markdown("---")
-    # Converter "Total" para número antes de plotar
-    df_categorias["Total_num"] = (
-        df_categorias["Total"]
-        .replace('[R$ ,]', '', regex=True)
-        .astype(float)
-    )
 
     fig = px.bar(
         df_categorias,
@@ -286,78 +140,50 @@ if not data.empty:
     )
     st.plotly_chart(fig, use_container_width=True)
 
-    # ------------------------------------------------------------------------------
-    # TABELA DINÂMICA - QUANTIDADE POR DIA
-    # ------------------------------------------------------------------------------
-    st.markdown("---")
+
+def secao_por_dia(data, selecoes, modo):
+    resultado = relatorio("categorias", data, selecoes, secao="por_dia")
+
+    # Tabela dinâmica - quantidade por dia
     st.markdown("<h1 style='color: #5D3A7A; font-size: 32px; text-align: center; margin-top: 30px;'>📋 Quantidade por Dia e Categoria</h1>", unsafe_allow_html=True)
 
-    df_pivot = df_filtrado.pivot_table(
-        index="Categoria", 
-        columns="Dia", 
-        values="QTD", 
-        aggfunc="sum",
-        margins=True,
-        margins_name='Total',
-        fill_value=0
-    )
-    
-    df_pivot_ft = df_pivot.style.format(
-        subset=df_pivot.columns[1:],
-        formatter=formata_brasil
-    )
+    df_pivot = resultado["pivot_qtd"]
 
-    st.dataframe(df_pivot_ft)
+    # Clicar numa célula abre as contas daquela categoria e dia (reexecuta só o fragmento)
+    evento = tabelas.exibir(df_pivot, "milhar", on_select="rerun", selection_mode="single-cell", key="pivot_qtd")
+    celula = detalhe.da_celula(selecoes, df_pivot, evento.selection.cells)
+    if celula is not None:
+        st.page_link("pages/Detalhamento.py", label="🔎 Ver contas da célula", query_params=detalhe.parametros(celula))
 
-    # ------------------------------------------------------------------------------
-    # TABELA DINÂMICA - TOTAL LÍQUIDO POR DIA
-    # ------------------------------------------------------------------------------
+    # Tabela dinâmica - total líquido por dia
     st.markdown("---")
     st.markdown("<h1 style='color: #5D3A7A; font-size: 32px; text-align: center; margin-top: 30px;'>💰 Total Líquido por Dia e Categoria</h1>", unsafe_allow_html=True)
 
-    df_pivot_total = df_filtrado.pivot_table(
-        index="Categoria", 
-        columns="Dia", 
-        values="TotalLiq", 
-        aggfunc="sum", 
-        fill_value=0,
-        margins=True,
-        margins_name='Total'
-    )
-    
-    df_pivot_total_ft = df_pivot_total.style.format(
-        subset=df_pivot.columns[1:],
-        formatter=formata_brasil
-    )
+    df_pivot_total = resultado["pivot_total"]
 
-    st.dataframe(df_pivot_total_ft)
-    # ------------------------------------------------------------------------------
-    # GRÁFICO DE LINHA - TENDÊNCIA DE FATURAMENTO POR DIA
-    # ------------------------------------------------------------------------------
-    st.markdown("---")
-    
-    df_trend = df_filtrado.pivot_table(
-        index="Dia", 
-        columns="Categoria", 
-        values="TotalLiq", 
-        aggfunc="sum", 
-        fill_value=0
-    ).reset_index()
-
-    df_trend_long = df_trend.melt(
-        id_vars=["Dia"], 
-        var_name="Categoria", 
-        value_name="Faturamento"
-    )
+    evento = tabelas.exibir(df_pivot_total, "milhar", on_select="rerun", selection_mode="single-cell", key="pivot_total")
+    celula = detalhe.da_celula(selecoes, df_pivot_total, evento.selection.cells)
+    if celula is not None:
+        st.page_link("pages/Detalhamento.py", label="🔎 Ver contas da célula", query_params=detalhe.parametros(celula))
+
+
+def secao_graficos(data, selecoes, modo):
+    resultado = relatorio("categorias", data, selecoes, secao="graficos")
+
+    # Gráfico de linha - tendência de faturamento
+    # Eixo de datas reais; a resolução (dia/semana/mês) cabe no orçamento de pontos
+    df_trend_long = resultado["tendencia"]
+    resolucao = graficos.ROTULOS[resultado["resolucao"]]
+    pontos = len(df_trend_long)
 
     fig = px.line(
         df_trend_long,
-        x="Dia",
+        x="Data",
         y="Faturamento",
         color="Categoria",
-        markers=True,
-        line_shape="spline",
-        title="📈 Tendência de Vendas por Dia"
+        markers=pontos <= graficos.LIMITE_WEBGL,
+        render_mode=graficos.modo_renderizacao(pontos),
+        title=f"📈 Tendência de Vendas por {resolucao}"
     )
 
     fig.update_layout(
@@ -366,7 +192,7 @@ if not data.empty:
             "xanchor": "center",
             "font": dict(size=22, family="Arial, sans-serif", color="#5D3A7A")
         },
-        xaxis_title="Dia do Mês", 
+        xaxis_title=resolucao,
         yaxis_title="Faturamento (R$)",
         plot_bgcolor="white",
         legend_title="Categoria",
@@ -374,62 +200,14 @@ if not data.empty:
         yaxis=dict(showgrid=True, gridcolor="lightgray"),
         font=dict(size=14)
     )
-    fig.update_traces(mode="lines+markers", line=dict(width=2, dash="dot"))
+    fig.update_traces(line=dict(width=2, dash="dot"))
     st.plotly_chart(fig, use_container_width=True)
 
-    # ------------------------------------------------------------------------------
-    # GRÁFICO DE BARRAS AGRUPADAS - VENDAS POR DIA DA SEMANA
-    # ------------------------------------------------------------------------------
+    # Gráfico de barras agrupadas - vendas por dia da semana
     st.markdown("---")
-    
-    st.markdown("<h1 style='color: #5D3A7A; font-size: 32px; text-align: center; margin-top: 30px;'></h1>")
-
-    # Converter "Data" para datetime
-    df_filtrado["Data"] = pd.to_datetime(df_filtrado["Data"], errors="coerce")
-
-    # Criar a coluna com os dias da semana
-    df_filtrado["Dia_Semana"] = df_filtrado["Data"].dt.day_name()
-
-    # Traduzir dias para português
-    traducao_dias = {
-        "Monday": "Segunda-feira",
-        "Tuesday": "Terça-feira",
-        "Wednesday": "Quarta-feira",
-        "Thursday": "Quinta-feira",
-        "Friday": "Sexta-feira",
-        "Saturday": "Sábado",
-        "Sunday": "Domingo"
-    }
-    df_filtrado["Dia_Semana"] = df_filtrado["Dia_Semana"].map(traducao_dias)
-
-    # Ordenação correta
-    dias_semana_ordenados = [
-        "Segunda-feira", "Terça-feira", "Quarta-feira",
-        "Quinta-feira", "Sexta-feira", "Sábado", "Domingo"
-    ]
-    df_filtrado = df_filtrado[df_filtrado["Dia_Semana"].notna()]
-
-    df_semana = df_filtrado.pivot_table(
-        index="Dia_Semana",
-        columns="Categoria",
-        values="TotalLiq",
-        aggfunc="sum",
-        fill_value=0
-    ).reset_index()
-
-    # Força a ordem
-    df_semana["Dia_Semana"] = pd.Categorical(
-        df_semana["Dia_Semana"],
-        categories=dias_semana_ordenados,
-        ordered=True
-    )
-    df_semana = df_semana.sort_values("Dia_Semana")
 
-    df_long = df_semana.melt(
-        id_vars=["Dia_Semana"],
-        var_name="Categoria",
-        value_name="Faturamento"
-    )
+    # Dias da semana já traduzidos e ordenados de segunda a domingo
+    df_long = resultado["semana"]
 
     fig = px.bar(
         df_long,
@@ -457,6 +235,158 @@ if not data.empty:
     )
     st.plotly_chart(fig, use_container_width=True)
 
+
+# Aba -> (seção de painel.relatorios, função que desenha)
+SECOES = {
+    "📋 Resumo": ("resumo", secao_resumo),
+    "📅 Por dia": ("por_dia", secao_por_dia),
+    "📈 Gráficos": ("graficos", secao_graficos),
+}
+
+
+@st.fragment
+def secoes(data, selecoes, modo):
+    # Só a aba aberta é calculada e desenhada; trocar de aba ou clicar numa
+    # célula reexecuta só este fragmento, não a página (filtros e totais)
+    abas = st.tabs(list(SECOES), on_change="rerun", key="secao_categorias")
+    for aba, (secao, desenhar) in zip(abas, SECOES.values()):
+        if aba.open:
+            with aba, metricas.secao(f"categorias.{secao}"):
+                desenhar(data, selecoes, modo)
+
+
+# ------------------------------------------------------------------------------
+# Título principal
+# ------------------------------------------------------------------------------
+st.markdown("<h1 style='font-size: 32px; color: #5D3A7A'>📊 Dashboard Vendas por Categoria</h1>", unsafe_allow_html=True)
+
+# ------------------------------------------------------------------------------
+# Carregar os dados (snapshot compartilhado pelo processo, sem cópia por sessão)
+# ------------------------------------------------------------------------------
+execucao.marcar("dados")
+data = get_data()
+mostrar_idade()
+
+# ------------------------------------------------------------------------------
+# Se dados estiverem disponíveis, processa
+# ------------------------------------------------------------------------------
+if not data.empty:
+    # Os tipos já vêm normalizados de get_data (painel.schema): nada de astype aqui
+
+    # Ano e mês atuais (para usar como default)
+    ano_atual = datetime.now().year
+    mes_atual = MESES[datetime.now().month]
+
+    # Opções para filtros (com "Todos" incluído)
+    opcoes_empresa = ["Todos"] + sorted(data["Empresa"].unique())
+    opcoes_ano = ["Todos"] + anos(data)
+    opcoes_mes = ["Todos"] + list(MESES.values())  # Usa todos os nomes de mês
+    opcoes_categoria = ["Todos"] + sorted(data["Categoria"].unique())
+
+    # ------------------------------------------------------------------------------
+    # SIDEBAR - Filtros
+    # ------------------------------------------------------------------------------
+    empresas_selecionadas = st.sidebar.multiselect(
+        "Empresa", 
+        options=opcoes_empresa, 
+        default=["Todos"]
+    )
+    anos_selecionados = st.sidebar.multiselect(
+        "Ano", 
+        options=opcoes_ano, 
+        default=[ano_atual]
+    )
+    meses_selecionados = st.sidebar.multiselect(
+        "Mês", 
+        options=opcoes_mes, 
+        default=[mes_atual]
+    )
+    categorias_selecionadas = st.sidebar.multiselect(
+        "Categoria", 
+        options=opcoes_categoria, 
+        default=["Todos"]
+    )
+
+    # ------------------------------------------------------------------------------
+    # Aplicando filtros
+    # ------------------------------------------------------------------------------
+    # Todos os quadros desta página são somas do cubo agregado (painel.relatorios);
+    # Empresa × mês sem outros filtros vem do lote pré-calculado
+    selecoes = {
+        "Empresa": selecao(empresas_selecionadas),
+        "Ano": selecao(anos_selecionados),
+        "Mes": None if "Todos" in meses_selecionados else numeros_meses(meses_selecionados),
+        "Categoria": selecao(categorias_selecionadas),
+    }
+    # Comparação com o período anterior (mesma agregação para os dois períodos);
+    # com todos os meses selecionados só o ano anterior é oferecido
+    comparar = st.sidebar.selectbox(
+        "Comparar com",
+        options=["Nenhum"] + relatorios.comparacoes(selecoes),
+    )
+    modo = relatorios.COMPARACOES.get(comparar)
+    # Ano em "Todos" ou sem nenhum ano escolhido: sem comparação
+    if modo is not None and not selecoes["Ano"]:
+        st.sidebar.caption("Escolha o ano para comparar períodos.")
+        modo = None
+
+    # Meses escolhidos que ainda não foram baixados vêm do backend agora (?ano=&mes=)
+    data = garantir(data, selecoes, modo)
+    execucao.marcar("relatorio")
+    if modo is None:
+        resultado = relatorio("categorias", data, selecoes, secao="totais")
+        variacoes = {}
+    else:
+        comparado = comparacao(data, selecoes, modo)
+        resultado = comparado["totais"]["atual"]
+        variacoes = comparado["totais"]["variacao"]
+        # Mês corrente: os dois períodos vão só até hoje
+        if comparado["ate_dia"] is not None:
+            comparar = f"{comparar} (até o dia {comparado['ate_dia']})"
+
+    # ------------------------------------------------------------------------------
+    # MÉTRICAS PRINCIPAIS
+    # ------------------------------------------------------------------------------
+    execucao.marcar("totais")
+    total_geral = resultado["total_geral"]
+    total_servicos = resultado["total_servicos"]
+
+    def rodape_variacao(nome):
+        # Variação contra o período de comparação, em verde ou vermelho
+        if nome not in variacoes:
+            return ""
+        delta = variacoes[nome]
+        cor = "#5D3A7A" if pd.isna(delta) else ("green" if delta >= 0 else "red")
+        seta = "" if pd.isna(delta) else ("▲ " if delta >= 0 else "▼ ")
+        return f"<p style='color: {cor}; margin-top: -10px;'>{seta}{valor(percentual, abs(delta), casas=1, vazio='-')} vs {comparar.lower()}</p>"
+    st.page_link("pages/Detalhamento.py", label="🔎 Detalhar contas", query_params=detalhe.parametros(selecoes))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="info-card" style="background-color: #D6C2E9; color: #5D3A7A; text-align: 'center'">
+            <h3>💰 Total Geral</h3>
+            <h2>R$ {valor(milhar, total_geral)}</h2>{rodape_variacao("total_geral")}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="info-card" style="background-color: #D6C2E9; color: #5D3A7A">
+            <h3>🛠️ Total de Serviços</h3>
+            <h2>R$ {valor(milhar, total_servicos)}</h2>{rodape_variacao("total_servicos")}
+        </div>
+        """, unsafe_allow_html=True)
+
+    # ------------------------------------------------------------------------------
+    # SEÇÕES (uma aba por vez, calculada e desenhada só quando aberta)
+    # ------------------------------------------------------------------------------
+    execucao.marcar("secoes")
+    st.markdown("---")
+    secoes(data, selecoes, modo)
+
 else:
     # Caso o DataFrame esteja vazio ou se houve erro na requisição
     st.warning("Não foi possível carregar os dados ou não há dados disponíveis.")
+
+mostrar_metricas(execucao)
@@ -0,0 +1,125 @@
+import streamlit as st
+from painel import detalhe, metricas, tabelas
+from painel.dados import anos, garantir, get_data, indice, mostrar_idade, mostrar_metricas
+from painel.formatacao import milhar, moeda, valor
+from painel.indice import selecao
+from painel.relatorios import COLUNAS_FILTRO
+from painel.schema import MESES, numeros_meses
+
+# ------------------------------------------------------------------------------
+# Configurações iniciais e estilo
+# ------------------------------------------------------------------------------
+st.set_page_config(
+    page_title='Detalhamento de Contas',
+    layout='wide'
+)
+
+# CSS para deixar o visual coerente com as outras páginas
+st.markdown("""
+    <style>
+        .stMultiSelect [data-baseweb="tag"] {
+            background-color: #8A4CCC !important;
+            color: white !important;
+            border-radius: 8px;
+        }
+
+        div[data-baseweb="select"]:focus-within > div {
+            border: 1px solid #8A4CCC !important;
+        }
+    </style>
+""", unsafe_allow_html=True)
+
+# Tempos por seção desta execução (painel.metricas)
+execucao = metricas.Execucao("detalhamento")
+
+st.markdown("<h1 style='font-size: 32px; color: #5D3A7A'>🔎 Detalhamento de Contas</h1>", unsafe_allow_html=True)
+
+execucao.marcar("dados")
+data = get_data()
+mostrar_idade()
+
+if not data.empty:
+    # ------------------------------------------------------------------------------
+    # SIDEBAR - Filtros (os padrões vêm da URL quando a página é aberta a partir
+    # de um card ou de uma célula das outras páginas)
+    # ------------------------------------------------------------------------------
+    da_url = detalhe.ler_parametros(st.query_params)
+
+    def padrao(coluna, opcoes, nomes=None):
+        valores = da_url.get(coluna)
+        if nomes and valores is not None:
+            valores = [nomes.get(v) for v in valores]
+        valores = [v for v in valores or [] if v in opcoes]
+        return valores or ["Todos"]
+
+    opcoes_empresa = ["Todos"] + sorted(data["Empresa"].unique())
+    opcoes_ano = ["Todos"] + anos(data)
+    opcoes_mes = ["Todos"] + list(MESES.values())
+    opcoes_dia = ["Todos"] + sorted(data["Dia"].unique().tolist())
+    opcoes_categoria = ["Todos"] + sorted(data["Categoria"].unique())
+
+    empresas_selecionadas = st.sidebar.multiselect("Empresa", opcoes_empresa, default=padrao("Empresa", opcoes_empresa))
+    anos_selecionados = st.sidebar.multiselect("Ano", opcoes_ano, default=padrao("Ano", opcoes_ano))
+    meses_selecionados = st.sidebar.multiselect("Mês", opcoes_mes, default=padrao("Mes", opcoes_mes, MESES))
+    dias_selecionados = st.sidebar.multiselect("Dia", opcoes_dia, default=padrao("Dia", opcoes_dia))
+    categorias_selecionadas = st.sidebar.multiselect("Categoria", opcoes_categoria, default=padrao("Categoria", opcoes_categoria))
+    conta = st.sidebar.text_input("Conta").strip()
+
+    selecoes = {
+        "Empresa": selecao(empresas_selecionadas),
+        "Ano": selecao(anos_selecionados),
+        "Mes": None if "Todos" in meses_selecionados else numeros_meses(meses_selecionados),
+        "Dia": selecao(dias_selecionados),
+        "Categoria": selecao(categorias_selecionadas),
+    }
+
+    # ------------------------------------------------------------------------------
+    # Ordenação e paginação (feitas no servidor, só a página vai para o navegador)
+    # ------------------------------------------------------------------------------
+    col_ordem, col_sentido, col_tamanho, col_pagina = st.columns([3, 2, 2, 2])
+    with col_ordem:
+        ordem = st.selectbox("Ordenar por", detalhe.COLUNAS, index=detalhe.COLUNAS.index("Data"))
+    with col_sentido:
+        sentido = st.radio("Sentido", ["Decrescente", "Crescente"], horizontal=True)
+    with col_tamanho:
+        tamanho = st.selectbox("Linhas por página", [25, 50, 100, 500], index=1)
+
+    # Meses escolhidos que ainda não foram baixados vêm do backend agora (?ano=&mes=)
+    data = garantir(data, selecoes)
+    execucao.marcar("consulta")
+    encontradas = detalhe.posicoes(data, indice(data, COLUNAS_FILTRO), selecoes, conta)
+    total_linhas = len(encontradas)
+    total_paginas = max(1, -(-total_linhas // tamanho))
+    with col_pagina:
+        pagina = st.number_input(f"Página (de {total_paginas})", min_value=1, max_value=total_paginas, value=1)
+
+    linhas, somas = detalhe.consultar(
+        data, encontradas, ordem=ordem, crescente=sentido == "Crescente", pagina=int(pagina), tamanho=tamanho,
+    )
+    execucao.anotar(linhas=total_linhas)
+
+    # ------------------------------------------------------------------------------
+    # Totais das linhas filtradas e página atual
+    # ------------------------------------------------------------------------------
+    execucao.marcar("pagina")
+    st.caption(
+        f"{valor(milhar, total_linhas)} linhas · QTD {valor(milhar, somas['QTD'])} · "
+        f"Total Líquido {valor(moeda, somas['TotalLiq'])} · Serviço {valor(moeda, somas['servico'])}"
+    )
+
+    # Valores seguem numéricos, com o texto pt_BR no Styler (painel.tabelas)
+    formatos = {"QTD": "milhar", "TotalLiq": "moeda", "servico": "moeda"}
+    st.dataframe(
+        tabelas.formatar(linhas.style, formatos.get),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Data": st.column_config.DateColumn(format="DD/MM/YYYY"),
+            **{nome: tabelas.coluna(formato) for nome, formato in formatos.items()},
+        },
+    )
+
+else:
+    st.warning("Não foi possível carregar os dados ou não há dados disponíveis.")
+
+mostrar_metricas(execucao)
@@ -0,0 +1 @@
+"""Módulos compartilhados pelas páginas do painel (dados, cálculos e exibição)."""
@@ -0,0 +1,120 @@
+"""Cliente HTTP compartilhado para a API de contas.
+
+Uma única ``requests.Session`` por processo, com pool de conexões, timeouts
+explícitos e retentativas com backoff. Chamadas idênticas feitas ao mesmo tempo
+(várias sessões com o cache frio, por exemplo) são agrupadas em voo único: só a
+primeira vai ao backend e as demais esperam e recebem o mesmo resultado.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from painel import metricas
+
+# PAINEL_URL_BASE aponta o painel para outro backend (o stub de bench.servidor_stub, por exemplo)
+URL_BASE = os.environ.get("PAINEL_URL_BASE", "http://192.168.10.11:5005")
+
+# (conexão, leitura) em segundos; a leitura é longa porque o histórico completo é grande
+TIMEOUT = (5, 120)
+
+RETENTATIVAS = Retry(
+    total=3,
+    connect=3,
+    read=2,
+    backoff_factor=1,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False,
+)
+
+_sessao = None
+_sessao_lock = threading.Lock()
+
+_voos = {}
+_voos_lock = threading.Lock()
+
+
+class _Voo:
+    def __init__(self):
+        self.pronto = threading.Event()
+        self.resultado = None
+        self.erro = None
+
+
+def sessao():
+    """Sessão HTTP do processo, criada na primeira chamada."""
+    global _sessao
+    with _sessao_lock:
+        if _sessao is None:
+            nova = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=RETENTATIVAS)
+            nova.mount("http://", adaptador)
+            nova.mount("https://", adaptador)
+            _sessao = nova
+        return _sessao
+
+
+def voo_unico(chave, funcao):
+    """Executa ``funcao()`` uma vez para todas as chamadas simultâneas com a mesma chave.
+
+    Quem chega enquanto a chamada líder está em andamento bloqueia até ela terminar
+    e recebe o mesmo resultado (ou a mesma exceção). Terminada a chamada, a próxima
+    com a mesma chave volta a executar normalmente.
+    """
+    with _voos_lock:
+        voo = _voos.get(chave)
+        lider = voo is None
+        if lider:
+            voo = _Voo()
+            _voos[chave] = voo
+
+    if not lider:
+        voo.pronto.wait()
+        if voo.erro is not None:
+            raise voo.erro
+        return voo.resultado
+
+    try:
+        voo.resultado = funcao()
+        return voo.resultado
+    except BaseException as erro:
+        voo.erro = erro
+        raise
+    finally:
+        with _voos_lock:
+            del _voos[chave]
+        voo.pronto.set()
+
+
+def _ler_json(response):
+    return response.json()
+
+
+def buscar(caminho, params=None, ler=_ler_json, stream=False, headers=None):
+    """GET em ``URL_BASE + caminho`` com voo único; ``ler`` converte a resposta.
+
+    Com ``stream=True`` o corpo não é baixado antes de ``ler`` ser chamada, que
+    pode consumi-lo aos pedaços por ``response.raw``. ``headers`` vão na
+    requisição (negociação de formato, por exemplo).
+    """
+    chave = (caminho, tuple(sorted((params or {}).items())), ler, tuple(sorted((headers or {}).items())))
+
+    def requisitar():
+        with metricas.secao(f"api {caminho}") as info:
+            with sessao().get(
+                URL_BASE + caminho, params=params, headers=headers, timeout=TIMEOUT, stream=stream,
+            ) as response:
+                response.raise_for_status()
+                resultado = ler(response)
+                # Bytes recebidos pela rede (antes de descomprimir)
+                info["bytes"] = response.raw.tell() if stream else len(response.content)
+                info["formato"] = response.headers.get("Content-Type", "")
+                info["compressao"] = response.headers.get("Content-Encoding", "")
+            if hasattr(resultado, "__len__"):
+                info["linhas"] = len(resultado)
+            return resultado
+
+    return voo_unico(chave, requisitar)
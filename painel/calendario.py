@@ -0,0 +1,78 @@
+"""Dimensão de calendário: os atributos de cada data calculados uma única vez.
+
+O dia da semana era derivado de novo das datas a cada execução. O
+``Calendario`` tem uma linha por dia de um intervalo contínuo, identificada
+pela chave inteira "dias desde 1970-01-01" (a mesma representação de
+``datetime64[D]``); a linha de uma chave é ``chave - inicio``, então levar um
+atributo a qualquer número de linhas é um ``take`` do numpy, sem join nem
+``.dt``. Só entram aqui os atributos que o cubo de fato usa.
+"""
+import numpy as np
+import pandas as pd
+
+DIAS_SEMANA = ["Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira", "Sexta-feira", "Sábado", "Domingo"]
+# Chave das datas inválidas (Dia 31 em abril, Dia 0...)
+SEM_DATA = -1
+
+
+def datas(anos, meses, dias):
+    """Datas (``datetime64[D]``) de Ano/Mes/Dia inteiros; NaT onde a combinação não existe."""
+    anos = np.asarray(anos, dtype=np.int64)
+    meses = np.asarray(meses, dtype=np.int64)
+    dias = np.asarray(dias, dtype=np.int64)
+    inicio_mes = ((anos - 1970) * 12 + meses - 1).astype("datetime64[M]")
+    resultado = inicio_mes.astype("datetime64[D]") + (dias - 1)
+    # Dias além do fim do mês caem no mês seguinte: esses não são datas válidas
+    validas = (meses >= 1) & (meses <= 12) & (dias >= 1) & (resultado.astype("datetime64[M]") == inicio_mes)
+    return np.where(validas, resultado, np.datetime64("NaT", "D"))
+
+
+def chaves(valores):
+    """Chave inteira (dias desde 1970-01-01) de datas; ``SEM_DATA`` para NaT."""
+    dias = np.asarray(valores).astype("datetime64[D]")
+    return np.where(np.isnat(dias), SEM_DATA, dias.astype(np.int64))
+
+
+class Calendario:
+    def __init__(self, inicio, fim):
+        inicio = np.datetime64(inicio, "D")
+        fim = np.datetime64(fim, "D")
+        self.inicio = int(inicio.astype(np.int64))
+        dias = np.arange(inicio, fim + 1)
+        numeros = dias.astype(np.int64)
+        data = pd.DatetimeIndex(dias)
+        # 1970-01-01 foi uma quinta-feira (3, contando a segunda como 0)
+        dia_semana = ((numeros + 3) % 7).astype(np.int8)
+        self.tabela = pd.DataFrame({
+            "Data": data,
+            "Ano": data.year.astype(np.int16),
+            "Mes": data.month.astype(np.int8),
+            "Dia": data.day.astype(np.int8),
+            "Dia_Semana": dia_semana,
+        })
+
+    @classmethod
+    def cobrindo(cls, valores):
+        """Calendário do menor ao maior dos ``valores`` (datas); um dia só se não houver nenhuma."""
+        dias = np.asarray(valores).astype("datetime64[D]")
+        dias = dias[~np.isnat(dias)]
+        if dias.size == 0:
+            hoje = np.datetime64("today", "D")
+            return cls(hoje, hoje)
+        return cls(dias.min(), dias.max())
+
+    def coluna(self, nome, chaves_):
+        """Atributo ``nome`` para cada chave (chaves fora do intervalo ficam ausentes)."""
+        valores = self.tabela[nome]
+        posicao = np.asarray(chaves_, dtype=np.int64) - self.inicio
+        fora = (posicao < 0) | (posicao >= len(self.tabela))
+        if isinstance(valores.dtype, pd.CategoricalDtype):
+            codigos = np.where(fora, -1, valores.cat.codes.to_numpy()[np.clip(posicao, 0, len(valores) - 1)])
+            return pd.Categorical.from_codes(codigos, dtype=valores.dtype)
+        resultado = valores.to_numpy()[np.clip(posicao, 0, len(valores) - 1)]
+        if fora.any():
+            resultado = np.where(fora, np.nan, resultado)
+        return resultado
+
+    def memoria(self):
+        return int(self.tabela.memory_usage(index=True, deep=False).sum())
@@ -0,0 +1,84 @@
+"""Totais por categoria principal atribuídos por conta, calculados numa só passada.
+
+Uma conta "pertence" a uma categoria principal quando tem pelo menos uma linha
+dela; tudo o que a conta consumiu (líquido, serviço, categorias secundárias)
+entra no card daquela principal. Em vez de refiltrar as contas para cada
+categoria, marcamos numa matriz conta × principal quais principais cada conta
+contém e os totais de todas as principais saem de produtos de matrizes.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _posicoes(serie, valores):
+    # Posição de cada linha em ``valores`` (-1 quando não está na lista)
+    return pd.Categorical(serie, categories=valores).codes.astype(np.intp)
+
+
+def resumo_categorias_principais(df, principais, secundarias):
+    """Resumo dos cards de cada categoria principal.
+
+    Devolve ``(resumo, subcategorias)``: ``resumo`` tem uma linha por principal
+    com valor_liquido, servico, valor, valor_categoria, qtd_categoria,
+    ticket_medio e preco_medio; ``subcategorias`` tem o TotalLiq das secundárias
+    (em ordem alfabética) das contas de cada principal, com NaN onde a
+    secundária não aparece.
+    """
+    secundarias = sorted(secundarias)
+    contas, _ = pd.factorize(df["conta"])
+    n_contas = int(contas.max()) + 1 if len(contas) else 0
+    liquido = df["TotalLiq"].to_numpy(dtype=np.float64)
+    servico = df["servico"].to_numpy(dtype=np.float64)
+    qtd = df["QTD"].to_numpy(dtype=np.float64)
+
+    principal = _posicoes(df["Categoria"], principais)
+    linhas_principais = principal >= 0
+    k = len(principais)
+
+    # Matriz conta × principal: a conta tem alguma linha da principal?
+    pertence = np.zeros((n_contas, k), dtype=np.float64)
+    pertence[contas[linhas_principais], principal[linhas_principais]] = 1.0
+
+    liquido_conta = np.bincount(contas, weights=liquido, minlength=n_contas)
+    servico_conta = np.bincount(contas, weights=servico, minlength=n_contas)
+
+    valor_liquido = pertence.T @ liquido_conta
+    servico_total = pertence.T @ servico_conta
+    valor = valor_liquido + servico_total
+
+    valor_categoria = np.bincount(principal[linhas_principais], weights=liquido[linhas_principais], minlength=k)
+    qtd_categoria = np.bincount(principal[linhas_principais], weights=qtd[linhas_principais], minlength=k)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ticket_medio = np.where(qtd_categoria > 0, valor / qtd_categoria, 0.0)
+        preco_medio = np.where(qtd_categoria > 0, valor_categoria / qtd_categoria, 0.0)
+
+    resumo = pd.DataFrame(
+        {
+            "valor_liquido": valor_liquido,
+            "servico": servico_total,
+            "valor": valor,
+            "valor_categoria": valor_categoria,
+            "qtd_categoria": qtd_categoria,
+            "ticket_medio": ticket_medio,
+            "preco_medio": preco_medio,
+        },
+        index=pd.Index(principais, name="Categoria"),
+    )
+
+    # Secundárias por conta (soma e presença), depois agregadas por principal
+    secundaria = _posicoes(df["Categoria"], secundarias)
+    linhas_secundarias = secundaria >= 0
+    s = len(secundarias)
+    chave = contas[linhas_secundarias] * s + secundaria[linhas_secundarias]
+    soma = np.bincount(chave, weights=liquido[linhas_secundarias], minlength=n_contas * s).reshape(n_contas, s)
+    presenca = np.bincount(chave, minlength=n_contas * s).reshape(n_contas, s)
+
+    valores_sub = pertence.T @ soma
+    presentes = (pertence.T @ presenca) > 0
+    subcategorias = pd.DataFrame(
+        np.where(presentes, valores_sub, np.nan),
+        index=resumo.index,
+        columns=secundarias,
+    )
+    return resumo, subcategorias
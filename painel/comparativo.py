@@ -0,0 +1,73 @@
+"""Metas × Realizado por categoria e bloco de dias do mês.
+
+Os blocos são definidos só pelos dias em que começam (``BLOCOS_PADRAO`` é o
+1 a 8 / 9 a 15 / 16 a 23 / 24 a 31 de sempre, ``SEMANAS`` quebra o mês de 7
+em 7 dias). Cada linha recebe o bloco com ``searchsorted`` e metas e realizado
+são somados com ``bincount`` numa grade categoria × bloco comum, de onde saem
+Meta, Rzdo e % de todos os blocos e do total de uma vez.
+"""
+import numpy as np
+import pandas as pd
+
+ULTIMO_DIA = 31
+BLOCOS_PADRAO = (1, 9, 16, 24)
+SEMANAS = (1, 8, 15, 22, 29)
+MEDIDAS = ["Meta", "Rzdo", "%"]
+
+
+def rotulos(inicios):
+    """Nome de cada bloco ("1 a 8", "9 a 15", ...)."""
+    fins = [inicio - 1 for inicio in inicios[1:]] + [ULTIMO_DIA]
+    return [f"{inicio} a {fim}" for inicio, fim in zip(inicios, fins)]
+
+
+def blocos(dias, inicios=BLOCOS_PADRAO):
+    """Posição do bloco de cada dia (-1 para dias fora de 1..31)."""
+    dias = np.asarray(dias, dtype=np.int64)
+    posicao = np.searchsorted(np.asarray(inicios), dias, side="right") - 1
+    return np.where((dias >= 1) & (dias <= ULTIMO_DIA), posicao, -1)
+
+
+def _somar(categorias, df, coluna_valor, inicios):
+    # Soma de ``coluna_valor`` na grade categoria × bloco (linhas fora da grade são ignoradas)
+    linha = pd.Categorical(df["Categoria"], categories=categorias).codes.astype(np.intp)
+    bloco = blocos(df["Dia"], inicios)
+    validas = (linha >= 0) & (bloco >= 0)
+    n_blocos = len(inicios)
+    chave = linha[validas] * n_blocos + bloco[validas]
+    valores = df[coluna_valor].to_numpy(dtype=np.float64)[validas]
+    soma = np.bincount(chave, weights=valores, minlength=len(categorias) * n_blocos)
+    return soma.reshape(len(categorias), n_blocos)
+
+
+def metas_x_realizado(metas, realizado, inicios=BLOCOS_PADRAO, coluna_meta="Meta_Diária", coluna_realizado="QTD"):
+    """Tabela numérica com (bloco, Meta/Rzdo/%) para cada bloco e para o Total.
+
+    As linhas são as categorias presentes em ``metas``; o % é Rzdo / Meta * 100,
+    zero quando ambos são zero e infinito quando só a meta é zero.
+    """
+    categorias = pd.Index(sorted(pd.unique(metas["Categoria"])), name="Categoria")
+    meta = _somar(categorias, metas, coluna_meta, inicios)
+    rzdo = _somar(categorias, realizado, coluna_realizado, inicios)
+
+    # Coluna de total ao lado dos blocos, para calcular tudo com as mesmas operações
+    meta = np.column_stack([meta, meta.sum(axis=1)])
+    rzdo = np.column_stack([rzdo, rzdo.sum(axis=1)])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alcance = rzdo / meta * 100
+    alcance[np.isnan(alcance)] = 0
+
+    # (categoria, bloco, medida) -> colunas na ordem bloco1 Meta/Rzdo/%, bloco2 ...
+    colunas = pd.MultiIndex.from_product([rotulos(inicios) + ["Total"], MEDIDAS])
+    valores = np.stack([meta, rzdo, alcance], axis=2).reshape(len(categorias), len(colunas))
+    return pd.DataFrame(valores, index=categorias, columns=colunas)
+
+
+def formato(coluna):
+    """Formato de exibição (``painel.tabelas``) de uma coluna (bloco, medida)."""
+    return "percentual" if coluna[1] == "%" else "milhar"
+
+
+def colunas_percentuais(tabela):
+    """Colunas de % de alcance, as que são coloridas pelos limiares."""
+    return [coluna for coluna in tabela.columns if coluna[1] == "%"]
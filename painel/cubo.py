@@ -0,0 +1,40 @@
+"""Cubo de vendas agregado em (Empresa, Ano, Mes, Dia, Categoria).
+
+Quase todos os quadros das páginas são somas de QTD, TotalLiq ou servico por
+algum subconjunto dessas dimensões; montado uma vez por versão dos dados, o
+cubo responde a eles com um número de linhas que depende de empresas × dias ×
+categorias, não da quantidade de contas.
+"""
+from painel import calendario
+from painel.indice import IndiceFiltro
+
+DIMENSOES = ["Empresa", "Ano", "Mes", "Dia", "Categoria"]
+MEDIDAS = ["QTD", "TotalLiq", "servico"]
+
+
+class Cubo:
+    def __init__(self, df):
+        tabela = df.groupby(DIMENSOES, observed=True, sort=False)[MEDIDAS].sum().reset_index()
+        # Data reconstruída da chave do dia, para os gráficos por data/dia da semana;
+        # os atributos da data vêm do calendário do intervalo (painel.calendario)
+        datas = calendario.datas(tabela["Ano"], tabela["Mes"], tabela["Dia"])
+        tabela["Data"] = datas.astype("datetime64[us]")
+        tabela["Chave_Data"] = calendario.chaves(datas)
+        self.calendario = calendario.Calendario.cobrindo(datas)
+        tabela["Dia_Semana"] = self.calendario.coluna("Dia_Semana", tabela["Chave_Data"])
+        self.tabela = tabela
+        self._indice = IndiceFiltro(tabela, ["Empresa", "Ano", "Mes"])
+
+    def filtrar(self, selecoes):
+        """Linhas do cubo que atendem a ``selecoes`` (coluna -> valores, ``None`` = todos)."""
+        principais = {coluna: selecoes.get(coluna) for coluna in ["Empresa", "Ano", "Mes"]}
+        tabela = self._indice.filtrar(self.tabela, principais)
+        for coluna in ["Dia", "Categoria"]:
+            valores = selecoes.get(coluna)
+            if valores is not None:
+                tabela = tabela[tabela[coluna].isin(valores)]
+        return tabela
+
+    def memoria(self):
+        """Bytes aproximados da tabela agregada, do índice e do calendário."""
+        return int(self.tabela.memory_usage(index=True).sum()) + self._indice.memoria() + self.calendario.memoria()
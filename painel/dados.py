@@ -0,0 +1,166 @@
+"""Carga dos dados de contas compartilhada pelas páginas do painel."""
+import os
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from painel import lote, metricas, relatorios
+from painel.cubo import Cubo
+from painel.indice import IndiceFiltro
+from painel.memo import Memo, normalizar
+from painel.registro import Registro
+from painel.snapshot import Atualizador, descrever_idade
+
+# Um registro por processo: as sessões compartilham o snapshot e o que deriva dele
+registro = Registro()
+# Quadros já calculados por (página, versões, filtros), também compartilhados
+quadros = Memo("quadros")
+
+# Anos oferecidos no filtro enquanto o histórico antigo ainda não chegou
+ANOS_HISTORICO = int(os.environ.get("PAINEL_ANOS_HISTORICO", "5"))
+
+
+@st.cache_resource
+def atualizador():
+    """Atualizador em segundo plano do processo (iniciado uma única vez)."""
+    # Depois de cada snapshot novo, o lote pré-calculado recebe os meses reescritos
+    return Atualizador(ao_publicar=lote.atualizar).iniciar()
+
+
+def get_data():
+    # Snapshot vigente, montado pela thread de atualização: nunca espera pela API.
+    return atualizador().atual().dados
+
+
+def particoes(selecoes, comparacao=None):
+    """Meses ``(ano, mes)`` que ``selecoes`` precisam (nenhum se o ano for "Todos").
+
+    Com ``comparacao`` (modo de ``relatorios.COMPARACOES``) inclui os meses do
+    período de comparação.
+    """
+    atuais = relatorios.periodos(selecoes)
+    if atuais is None:
+        return []
+    if comparacao is not None:
+        atuais, anteriores, _ = relatorios.periodos_comparacao(selecoes, comparacao)
+        atuais = atuais + anteriores
+    hoje = date.today()
+    return [periodo for periodo in atuais if periodo <= (hoje.year, hoje.month)]
+
+
+def garantir(data, selecoes, comparacao=None):
+    """Dados com os meses de ``selecoes`` no snapshot, baixando agora os que faltarem."""
+    atualiza = atualizador()
+    if atualiza.completo:
+        return data
+    snapshot = atualiza.garantir(particoes(selecoes, comparacao))
+    return snapshot.dados if snapshot.versao != versao(data) else data
+
+
+def anos(data):
+    """Opções de ano do filtro; enquanto o histórico chega, inclui os anos ainda não baixados."""
+    anos = set(data["Ano"].unique().tolist())
+    if not atualizador().completo:
+        atual = date.today().year
+        anos |= set(range(atual - ANOS_HISTORICO + 1, atual + 1))
+    return sorted(anos)
+
+
+def mostrar_idade():
+    """Idade do snapshot (e falha da última sincronização, se houver) na sidebar."""
+    atualiza = atualizador()
+    st.sidebar.caption(f"🕒 Dados sincronizados {descrever_idade(atualiza.atual().idade())}")
+    if not atualiza.completo:
+        st.sidebar.caption("📥 Histórico antigo ainda sendo baixado; meses escolhidos são buscados na hora.")
+    if atualiza.erro is not None:
+        st.sidebar.warning(f"❌ Erro ao buscar os dados: {atualiza.erro}")
+
+
+def admin():
+    """Painel de desempenho ligado por PAINEL_ADMIN=1 ou ``?admin=1`` na URL."""
+    return os.environ.get("PAINEL_ADMIN") == "1" or st.query_params.get("admin") == "1"
+
+
+def mostrar_metricas(execucao):
+    """Fecha a ``execucao`` da página e, para administradores, mostra os tempos na sidebar."""
+    medicoes = execucao.fim()
+    if not admin():
+        return
+    with st.sidebar.expander("⏱️ Desempenho"):
+        st.caption("Esta execução (ms)")
+        st.dataframe(pd.DataFrame(medicoes).drop(columns=["ts", "pagina"], errors="ignore"), hide_index=True)
+        st.caption("p50/p95 no processo")
+        st.dataframe(pd.DataFrame.from_dict(metricas.percentis(), orient="index"))
+        st.caption("Caches (acertos/falhas)")
+        st.dataframe(pd.DataFrame.from_dict(metricas.acertos_cache(), orient="index", columns=["acertos", "falhas"]))
+        uso = quadros.uso()
+        st.caption(
+            f"Quadros em memória: {uso['itens']} ({uso['bytes'] / 2**20:.1f} MB), "
+            f"acerto {uso['taxa_acerto']:.0%}"
+        )
+        st.caption(f"Métricas gravadas em {metricas.ARQUIVO_METRICAS}")
+
+
+def versao(data):
+    """Versão dos dados carregados por ``get_data`` (chave dos caches derivados)."""
+    return data.attrs.get("versao", "")
+
+
+def indice(data, colunas):
+    """Índice de filtros de ``data`` pelas ``colunas``, montado uma vez por versão."""
+    colunas = tuple(colunas)
+    return registro.obter(versao(data), ("indice", colunas), lambda: IndiceFiltro(data, colunas))
+
+
+def cubo(data):
+    """Cubo agregado de ``data`` (painel.cubo), montado uma vez por versão."""
+    return registro.obter(versao(data), ("cubo",), lambda: Cubo(data))
+
+
+def contexto(data, metas_diarias=None):
+    """Contexto de ``painel.relatorios`` com as estruturas compartilhadas do processo."""
+    indice_metas = None
+    if metas_diarias is not None:
+        indice_metas = registro.obter(
+            versao(data), ("indice_metas", metas_diarias.attrs.get("versao")),
+            lambda: IndiceFiltro(metas_diarias, relatorios.COLUNAS_FILTRO_METAS),
+        )
+    return relatorios.Contexto(
+        data, cubo(data), indice(data, relatorios.COLUNAS_FILTRO), metas_diarias, indice_metas,
+    )
+
+
+def relatorio(pagina, data, selecoes, metas_diarias=None, secao=None):
+    """Quadros de ``pagina`` para ``selecoes``: da memória, do lote pré-calculado ou ao vivo.
+
+    Com ``secao`` (``relatorios.SECOES``) só essa seção; sem ela, a página
+    inteira. A versão das metas só entra nas chaves das seções que as usam e
+    vem de ``metas_diarias`` (sem ler a planilha de novo).
+    """
+    if secao is None:
+        return {
+            chave: valor
+            for nome in relatorios.SECOES[pagina]
+            for chave, valor in relatorio(pagina, data, selecoes, metas_diarias, nome).items()
+        }
+    versao_metas = None
+    if relatorios.usa_metas(pagina, secao) and metas_diarias is not None:
+        versao_metas = metas_diarias.attrs.get("versao")
+    chave = (pagina, secao, versao(data), versao_metas, normalizar(selecoes))
+
+    def calcular():
+        resultado = lote.carregar(data.attrs.get("versoes_meses", {}), pagina, secao, selecoes, versao_metas)
+        metricas.cache("lote", resultado is not None)
+        if resultado is None:
+            resultado = relatorios.secao(pagina, secao, contexto(data, metas_diarias), selecoes)
+        return resultado
+
+    return quadros.obter(chave, calcular)
+
+
+def comparacao(data, selecoes, modo):
+    """Totais e resumo de Categorias do período selecionado e do de comparação (memorizados)."""
+    # O dia entra na chave: o trecho comparado do mês corrente cresce com ele
+    chave = ("comparacao", modo, date.today(), versao(data), normalizar(selecoes))
+    return quadros.obter(chave, lambda: relatorios.comparacao_categorias(contexto(data), selecoes, modo))
@@ -0,0 +1,127 @@
+"""Consulta das linhas de conta por trás de um quadro, paginada no servidor.
+
+Os filtros são resolvidos pelo índice do snapshot (``painel.indice``), a
+ordenação trabalha só com as posições filtradas (com ``argpartition`` quando a
+página pedida está no começo) e só as linhas da página são montadas num
+DataFrame e enviadas ao navegador.
+"""
+import numpy as np
+import pandas as pd
+
+COLUNAS = ["conta", "Data", "Empresa", "Categoria", "QTD", "TotalLiq", "servico"]
+MEDIDAS = ["QTD", "TotalLiq", "servico"]
+
+# Filtros que viajam na URL da página de detalhamento (?empresa=...&dia=...)
+PARAMETROS = {"empresa": "Empresa", "ano": "Ano", "mes": "Mes", "dia": "Dia", "categoria": "Categoria"}
+NUMERICOS = {"Ano", "Mes", "Dia"}
+
+
+def parametros(selecoes):
+    """Query params da página de detalhamento para ``selecoes`` (coluna -> valores)."""
+    return {
+        nome: ",".join(str(valor) for valor in selecoes[coluna])
+        for nome, coluna in PARAMETROS.items()
+        if selecoes.get(coluna) is not None
+    }
+
+
+def _inteiros(valores):
+    # URL editada à mão ou antiga: valores que não são números ficam de fora
+    return [int(valor) for valor in valores if valor.strip().lstrip("-").isdigit()]
+
+
+def ler_parametros(query_params):
+    """Seleções a partir dos query params (o inverso de ``parametros``).
+
+    Valores inválidos são ignorados; um filtro sem nenhum valor válido fica em "Todos".
+    """
+    selecoes = {}
+    for nome, coluna in PARAMETROS.items():
+        texto = query_params.get(nome)
+        if not texto:
+            continue
+        valores = texto.split(",")
+        if coluna in NUMERICOS:
+            valores = _inteiros(valores)
+        if valores:
+            selecoes[coluna] = valores
+    return selecoes
+
+
+def _codigos(serie, valores):
+    # Códigos dos valores pedidos numa coluna categórica (ignora os que não existem)
+    return serie.cat.categories.get_indexer(pd.Index(valores))
+
+
+def posicoes(data, indice, selecoes, conta=None):
+    """Posições das linhas de ``data`` que atendem a ``selecoes`` (e à ``conta``)."""
+    principais = {coluna: selecoes.get(coluna) for coluna in indice.colunas}
+    encontradas = indice.posicoes(principais)
+    if encontradas is None:
+        encontradas = np.arange(len(data))
+    filtros = [("Categoria", selecoes.get("Categoria"))]
+    if conta:
+        filtros.append(("conta", [conta]))
+    for coluna, valores in filtros:
+        if valores is None:
+            continue
+        codigos = data[coluna].cat.codes.to_numpy()[encontradas]
+        encontradas = encontradas[np.isin(codigos, _codigos(data[coluna], valores))]
+    return encontradas
+
+
+def _chave(serie):
+    # Valores comparáveis em numpy: códigos (categorias em ordem alfabética) ou inteiros
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.to_numpy().view("int64")
+    return serie.to_numpy()
+
+
+def ordenar(data, encontradas, coluna, crescente=True, ate=None):
+    """``encontradas`` ordenadas por ``coluna``; com ``ate`` só as ``ate`` primeiras são garantidas."""
+    chave = _chave(data[coluna])[encontradas]
+    if not crescente:
+        chave = -chave.astype(np.float64)
+    if ate is not None and ate < len(chave):
+        # O argpartition não é estável: empates no corte sairiam diferentes a cada
+        # página. Entram as menores que o valor do corte e, dos empatados nele,
+        # os primeiros pela posição (o mesmo começo da ordenação estável inteira).
+        limite = np.partition(chave, ate - 1)[ate - 1]
+        menores = np.flatnonzero(chave < limite)
+        empatadas = np.flatnonzero(chave == limite)[: ate - len(menores)]
+        primeiras = np.concatenate([menores, empatadas])
+        return encontradas[primeiras[np.argsort(chave[primeiras], kind="stable")]]
+    return encontradas[np.argsort(chave, kind="stable")]
+
+
+def consultar(data, encontradas, ordem="Data", crescente=False, pagina=1, tamanho=50):
+    """Página ``pagina`` (começando em 1) das linhas ``encontradas`` por ``posicoes``.
+
+    Devolve ``(linhas, somas)``: o DataFrame da página e as somas das medidas
+    sobre todas as linhas encontradas.
+    """
+    somas = {medida: float(data[medida].to_numpy()[encontradas].sum()) for medida in MEDIDAS}
+    inicio = (pagina - 1) * tamanho
+    ordenadas = ordenar(data, encontradas, ordem, crescente, ate=inicio + tamanho)
+    linhas = data.iloc[ordenadas[inicio:inicio + tamanho]][COLUNAS].reset_index(drop=True)
+    return linhas, somas
+
+
+def da_celula(selecoes, tabela, celulas, linha="Categoria", coluna="Dia"):
+    """``selecoes`` restritas à célula selecionada num pivot ``linha`` × ``coluna``.
+
+    ``celulas`` vem de ``st.dataframe(..., on_select="rerun")`` (posição da
+    linha, nome da coluna). Linha ou coluna "Total" não restringem nada.
+    """
+    if not celulas:
+        return None
+    posicao, nome = celulas[0]
+    restritas = dict(selecoes)
+    rotulo = tabela.index[posicao]
+    if rotulo != "Total":
+        restritas[linha] = [rotulo]
+    if str(nome) != "Total":
+        restritas[coluna] = [int(nome)]
+    return restritas
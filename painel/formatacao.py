@@ -0,0 +1,120 @@
+"""Formatação pt_BR de colunas inteiras de uma vez (moeda, milhar e percentual).
+
+Os símbolos vêm do babel uma única vez por processo; a formatação em si é feita
+com operações vetorizadas do numpy sobre a coluna toda, sem chamar o babel nem
+``str.format`` célula a célula. Os totais devem ser calculados nos valores
+numéricos e só depois formatados.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from babel.numbers import get_currency_symbol, get_decimal_symbol, get_group_symbol
+
+LOCALE = "pt_BR"
+
+
+@lru_cache(maxsize=None)
+def simbolos(locale=LOCALE):
+    """Separadores decimal e de milhar e prefixo da moeda (BRL) do locale."""
+    return {
+        "decimal": get_decimal_symbol(locale),
+        "grupo": get_group_symbol(locale),
+        # O babel separa o símbolo do número com espaço não separável
+        "moeda": get_currency_symbol("BRL", locale) + "\xa0",
+    }
+
+
+def _como_array(valores):
+    numeros = np.asarray(pd.to_numeric(pd.Series(valores), errors="coerce"), dtype=np.float64)
+    # Divisões por zero (ex.: % com meta zerada) são tratadas como ausentes
+    return np.where(np.isfinite(numeros), numeros, np.nan)
+
+
+def _agrupar(inteiros, separador):
+    # Insere o separador de milhar em inteiros >= 0, um nível de milhar por vez
+    resultado = np.char.mod("%d", inteiros % 1000)
+    resultado = np.where(inteiros >= 1000, np.char.zfill(resultado, 3), resultado)
+    potencia = 1000
+    while (inteiros >= potencia).any():
+        grupo = np.char.mod("%d", (inteiros // potencia) % 1000)
+        grupo = np.where(inteiros >= potencia * 1000, np.char.zfill(grupo, 3), grupo)
+        com_grupo = np.char.add(np.char.add(grupo, separador), resultado)
+        resultado = np.where(inteiros >= potencia, com_grupo, resultado)
+        potencia *= 1000
+    return resultado
+
+
+def _montar(texto, numeros, vazio, index):
+    # Sem ``vazio`` os NaN já saíram formatados como zero
+    serie = pd.Series(texto, index=index, dtype=object)
+    if vazio is not None:
+        serie[np.isnan(numeros) | (numeros == 0)] = vazio
+    return serie
+
+
+def _index(valores):
+    return valores.index if isinstance(valores, pd.Series) else None
+
+
+def _vazia(valores):
+    # As funções de texto do numpy não aceitam arrays vazios (zfill usa max())
+    return pd.Series([], index=_index(valores), dtype=object)
+
+
+def milhar(valores, vazio=None):
+    """Inteiros com separador de milhar ("1.234"); ``vazio`` substitui zeros e NaN."""
+    numeros = _como_array(valores)
+    if numeros.size == 0:
+        return _vazia(valores)
+    inteiros = np.rint(np.nan_to_num(numeros)).astype(np.int64)
+    texto = _agrupar(np.abs(inteiros), simbolos()["grupo"])
+    texto = np.where(inteiros < 0, np.char.add("-", texto), texto)
+    return _montar(texto, numeros, vazio, _index(valores))
+
+
+def moeda(valores, vazio=None):
+    """Valores em reais ("R$ 1.234,56"); ``vazio`` substitui zeros e NaN."""
+    s = simbolos()
+    numeros = _como_array(valores)
+    if numeros.size == 0:
+        return _vazia(valores)
+    centavos = np.rint(np.abs(np.nan_to_num(numeros)) * 100).astype(np.int64)
+    texto = np.char.add(s["moeda"], _agrupar(centavos // 100, s["grupo"]))
+    texto = np.char.add(np.char.add(texto, s["decimal"]), np.char.zfill(np.char.mod("%d", centavos % 100), 2))
+    texto = np.where((numeros < 0) & (centavos > 0), np.char.add("-", texto), texto)
+    return _montar(texto, numeros, vazio, _index(valores))
+
+
+def percentual(valores, casas=2, vazio=None):
+    """Percentuais já multiplicados por 100 ("12,34%")."""
+    s = simbolos()
+    numeros = _como_array(valores)
+    if numeros.size == 0:
+        return _vazia(valores)
+    escala = 10 ** casas
+    inteiros = np.rint(np.abs(np.nan_to_num(numeros)) * escala).astype(np.int64)
+    texto = _agrupar(inteiros // escala, s["grupo"])
+    if casas:
+        decimais = np.char.zfill(np.char.mod("%d", inteiros % escala), casas)
+        texto = np.char.add(np.char.add(texto, s["decimal"]), decimais)
+    texto = np.char.add(texto, "%")
+    texto = np.where((numeros < 0) & (inteiros > 0), np.char.add("-", texto), texto)
+    serie = pd.Series(texto, index=_index(valores), dtype=object)
+    if vazio is not None:
+        serie[np.isnan(numeros)] = vazio
+    return serie
+
+
+def formatar_tabela(tabela, formatador, **opcoes):
+    """Aplica ``formatador`` (milhar, moeda, percentual) a cada coluna numérica de ``tabela``."""
+    numericas = tabela.select_dtypes(include="number").columns
+    formatada = tabela.astype({coluna: object for coluna in numericas})
+    for coluna in numericas:
+        formatada[coluna] = formatador(tabela[coluna], **opcoes).to_numpy()
+    return formatada
+
+
+def valor(formatador, numero, **opcoes):
+    """Formata um único número (cards) com o mesmo motor das colunas."""
+    return formatador([numero], **opcoes).iloc[0]
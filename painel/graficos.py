@@ -0,0 +1,113 @@
+"""Séries dos gráficos de tendência num eixo de datas, com orçamento de pontos.
+
+A tendência agrupava só por ``Dia`` do mês, misturando dias de meses e anos
+diferentes. Aqui ela é somada por data real a partir do cubo, na resolução
+(dia, semana ou mês) mais fina que cabe em ``PONTOS_MAX`` pontos por série;
+séries grandes passam a ser desenhadas em WebGL (``scattergl``).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from painel.calendario import DIAS_SEMANA
+
+PONTOS_MAX = int(os.environ.get("PAINEL_PONTOS_GRAFICO", "400"))
+# Acima deste total de pontos o gráfico usa WebGL em vez de SVG
+LIMITE_WEBGL = 1000
+
+ROTULOS = {"dia": "Dia", "semana": "Semana", "mes": "Mês"}
+
+
+def _periodos(dias, resolucao):
+    # Início do período de cada data (datetime64[D]): o próprio dia, a segunda-feira ou o dia 1
+    if resolucao == "dia":
+        return dias
+    if resolucao == "semana":
+        # 1970-01-01 foi uma quinta-feira (dia 3 contando a segunda como 0)
+        numeros = dias.astype(np.int64)
+        return (numeros - (numeros + 3) % 7).astype("datetime64[D]")
+    return dias.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def _passo(resolucao):
+    return {"dia": np.timedelta64(1, "D"), "semana": np.timedelta64(7, "D")}.get(resolucao)
+
+
+def _eixo(inicio, fim, resolucao):
+    # Todos os períodos entre ``inicio`` e ``fim``, para a linha não pular os vazios
+    if resolucao == "mes":
+        return np.arange(inicio.astype("datetime64[M]"), fim.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    return np.arange(inicio, fim + 1, _passo(resolucao))
+
+
+def resolucao(inicio, fim, pontos=PONTOS_MAX):
+    """Resolução mais fina em que o intervalo ``inicio``..``fim`` cabe em ``pontos``."""
+    dias = int((fim - inicio) / np.timedelta64(1, "D")) + 1
+    if dias <= pontos:
+        return "dia"
+    if dias / 7 <= pontos:
+        return "semana"
+    return "mes"
+
+
+def tendencia(vendas, coluna="TotalLiq", pontos=PONTOS_MAX):
+    """Soma de ``coluna`` por período e Categoria (formato longo) e a resolução usada.
+
+    Devolve ``(tabela, resolucao)``; a tabela tem ``Data`` (início do período),
+    ``Categoria`` e ``Faturamento``, com zero nos períodos sem venda. Meses
+    demais para ``pontos`` são juntados em blocos de meses consecutivos.
+    """
+    vendas = vendas[vendas["Data"].notna()]
+    if vendas.empty:
+        return pd.DataFrame({"Data": pd.Series(dtype="datetime64[ns]"), "Categoria": [], "Faturamento": []}), "dia"
+    dias = vendas["Data"].to_numpy().astype("datetime64[D]")
+    escolhida = resolucao(dias.min(), dias.max(), pontos)
+    periodos = _periodos(dias, escolhida)
+    eixo = _eixo(periodos.min(), periodos.max(), escolhida)
+    posicao = np.searchsorted(eixo, periodos)
+    # Mesmo mês a mês não coube: blocos de ``bloco`` meses, rotulados pelo primeiro
+    bloco = -(-len(eixo) // pontos)
+    if bloco > 1:
+        posicao //= bloco
+        eixo = eixo[::bloco]
+
+    categorias = vendas["Categoria"].cat.remove_unused_categories()
+    codigos = categorias.cat.codes.to_numpy().astype(np.int64)
+    nomes = categorias.cat.categories
+    somas = np.bincount(
+        codigos * len(eixo) + posicao,
+        weights=vendas[coluna].to_numpy(dtype=np.float64),
+        minlength=len(nomes) * len(eixo),
+    )
+    tabela = pd.DataFrame({
+        "Data": np.tile(eixo, len(nomes)).astype("datetime64[ns]"),
+        "Categoria": np.repeat(nomes.to_numpy(dtype=object), len(eixo)),
+        "Faturamento": somas,
+    })
+    return tabela, escolhida
+
+
+def por_dia_semana(vendas, coluna="TotalLiq"):
+    """Soma de ``coluna`` por dia da semana e Categoria (formato longo, segunda a domingo).
+
+    ``vendas`` são linhas do cubo, que já trazem o ``Dia_Semana`` do calendário.
+    """
+    vendas = vendas[vendas["Data"].notna()]
+    categorias = vendas["Categoria"].cat.remove_unused_categories()
+    nomes = categorias.cat.categories
+    somas = np.bincount(
+        categorias.cat.codes.to_numpy().astype(np.int64) * 7 + vendas["Dia_Semana"].to_numpy().astype(np.int64),
+        weights=vendas[coluna].to_numpy(dtype=np.float64),
+        minlength=len(nomes) * 7,
+    )
+    return pd.DataFrame({
+        "Dia_Semana": pd.Categorical(np.tile(DIAS_SEMANA, len(nomes)), categories=DIAS_SEMANA, ordered=True),
+        "Categoria": np.repeat(nomes.to_numpy(dtype=object), 7),
+        "Faturamento": somas,
+    })
+
+
+def modo_renderizacao(pontos):
+    """``render_mode`` do plotly express: WebGL para séries grandes."""
+    return "webgl" if pontos > LIMITE_WEBGL else "svg"
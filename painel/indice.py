@@ -0,0 +1,56 @@
+"""Índice de filtros da sidebar, montado uma vez por versão dos dados.
+
+As linhas são agrupadas pela combinação das colunas filtráveis (por exemplo
+Empresa, Ano, Mes, Dia) e para cada combinação guardamos as posições das linhas.
+Resolver uma seleção é checar quais combinações passam — são poucas, não
+dependem do tamanho do histórico — e juntar as posições delas, sem varrer a
+tabela inteira com ``isin`` a cada mudança na sidebar.
+"""
+import numpy as np
+import pandas as pd
+
+
+def selecao(filtro):
+    """Valores de um multiselect da sidebar, ou ``None`` quando "Todos" está marcado."""
+    return None if "Todos" in filtro else list(filtro)
+
+
+class IndiceFiltro:
+    def __init__(self, df, colunas):
+        self.colunas = list(colunas)
+        self.total = len(df)
+        grupos = df.groupby(self.colunas, observed=True, sort=False).indices
+        chaves = list(grupos.keys())
+        if len(self.colunas) == 1:
+            chaves = [(chave,) for chave in chaves]
+        self._chaves = pd.DataFrame(chaves, columns=self.colunas)
+        self._posicoes = list(grupos.values())
+
+    def posicoes(self, selecoes):
+        """Posições (ordenadas) das linhas que atendem a ``selecoes``.
+
+        ``selecoes`` mapeia coluna -> valores aceitos (``None`` aceita tudo).
+        Devolve ``None`` quando nenhuma coluna restringe a seleção.
+        """
+        marcadas = np.ones(len(self._chaves), dtype=bool)
+        restringe = False
+        for coluna, valores in selecoes.items():
+            if valores is None:
+                continue
+            restringe = True
+            marcadas &= self._chaves[coluna].isin(valores).to_numpy()
+        if not restringe:
+            return None
+        grupos = np.flatnonzero(marcadas)
+        if grupos.size == 0:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate([self._posicoes[grupo] for grupo in grupos]))
+
+    def filtrar(self, df, selecoes):
+        """Aplica ``selecoes`` ao mesmo DataFrame usado para montar o índice."""
+        posicoes = self.posicoes(selecoes)
+        return df if posicoes is None else df.iloc[posicoes]
+
+    def memoria(self):
+        """Bytes aproximados das posições guardadas."""
+        return sum(posicoes.nbytes for posicoes in self._posicoes)
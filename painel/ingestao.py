@@ -0,0 +1,292 @@
+"""Leitura em streaming da resposta de /contas direto para colunas tipadas.
+
+Em vez de ``response.json()`` + ``pd.DataFrame(data)`` (que monta a lista inteira
+de dicts antes de o pandas ver qualquer coisa), o corpo é lido aos pedaços com
+ijson e cada registro vai direto para buffers compactos por coluna: números em
+``array`` de C e textos codificados em dicionário (código inteiro + lista de
+valores distintos). A cada ``TAMANHO_BLOCO`` registros os buffers viram arrays
+numpy; no fim os blocos são concatenados num DataFrame já tipado.
+
+O cliente também negocia formatos melhores com o backend: Arrow IPC (stream)
+ou Parquet, lidos direto em colunas pelo pyarrow sem passar por objetos Python,
+e o corpo comprimido com zstd ou gzip. JSON continua sendo aceito e é o que
+se lê quando o backend não conhece os outros (``ler_resposta`` decide pelo
+``Content-Type`` e pelo ``Content-Encoding`` da resposta).
+
+Para medir o ganho de memória num arquivo salvo da API::
+
+    python -m painel.ingestao contas.json
+"""
+import json
+import logging
+import math
+import sys
+import tracemalloc
+from array import array
+
+import ijson
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import requests
+import urllib3
+from urllib3.response import HAS_ZSTD
+
+try:
+    import resource
+except ImportError:
+    # Sem getrusage (Windows): o pico de RSS não é medido
+    resource = None
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional; sem ele o corpo vem em gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_BLOCO = 100_000
+
+COLUNAS_CATEGORICAS = ["conta", "Empresa", "Categoria"]
+COLUNAS_INTEIRAS = ["Ano", "Mes", "Dia"]
+COLUNAS_VALOR = ["QTD", "TotalLiq", "servico"]
+COLUNAS = COLUNAS_CATEGORICAS + COLUNAS_INTEIRAS + ["Data"] + COLUNAS_VALOR
+
+TIPO_ARROW = "application/vnd.apache.arrow.stream"
+TIPO_PARQUET = "application/vnd.apache.parquet"
+TIPO_JSON = "application/json"
+# Em ordem de preferência; JSON fica por último como reserva
+ACCEPT = f"{TIPO_ARROW}, {TIPO_PARQUET};q=0.9, {TIPO_JSON};q=0.5"
+
+
+def _numero(valor):
+    if valor is None:
+        return math.nan
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class _ColunaNumerica:
+    def __init__(self):
+        self.buffer = array("d")
+        self.blocos = []
+
+    def anexar(self, valor):
+        try:
+            self.buffer.append(valor)
+        except TypeError:
+            self.buffer.append(_numero(valor))
+
+    def fechar_bloco(self):
+        self.blocos.append(np.frombuffer(self.buffer, dtype=np.float64).copy())
+        self.buffer = array("d")
+
+    def valores(self):
+        return np.concatenate(self.blocos) if self.blocos else np.empty(0, dtype=np.float64)
+
+
+class _ColunaDicionario:
+    # Cada valor distinto é guardado uma vez; por linha fica só um código int32
+    def __init__(self):
+        self.dicionario = {}
+        self.buffer = array("i")
+        self.blocos = []
+
+    def anexar(self, valor):
+        if valor is None:
+            self.buffer.append(-1)
+        else:
+            self.buffer.append(self.dicionario.setdefault(valor, len(self.dicionario)))
+
+    def fechar_bloco(self):
+        self.blocos.append(np.frombuffer(self.buffer, dtype=np.int32).copy())
+        self.buffer = array("i")
+
+    def codigos(self):
+        return np.concatenate(self.blocos) if self.blocos else np.empty(0, dtype=np.int32)
+
+    def distintos(self):
+        return list(self.dicionario)
+
+
+def _montar(colunas):
+    dados = {}
+    for nome in COLUNAS_CATEGORICAS:
+        coluna = colunas[nome]
+        # Valores distintos podem colidir depois do str() (ex.: 10 e "10")
+        recodificar, categorias = pd.Index([str(valor) for valor in coluna.distintos()], dtype=object).factorize()
+        codigos = coluna.codigos()
+        codigos = np.where(codigos >= 0, recodificar[np.maximum(codigos, 0)], -1)
+        dados[nome] = pd.Categorical.from_codes(codigos, categories=categorias)
+    for nome in COLUNAS_INTEIRAS:
+        valores = colunas[nome].valores()
+        dados[nome] = np.nan_to_num(valores, nan=0).astype(np.int64)
+    # As datas se repetem muito: converte só os valores distintos e expande pelos códigos
+    coluna_data = colunas["Data"]
+    datas = pd.to_datetime(pd.Series(coluna_data.distintos(), dtype=object), errors="coerce")
+    codigos = coluna_data.codigos()
+    datas = pd.DatetimeIndex(datas).append(pd.DatetimeIndex([pd.NaT]))
+    dados["Data"] = datas[np.where(codigos >= 0, codigos, len(datas) - 1)]
+    for nome in COLUNAS_VALOR:
+        dados[nome] = np.nan_to_num(colunas[nome].valores(), nan=0.0)
+    return pd.DataFrame(dados, columns=COLUNAS)
+
+
+def ler_contas(fonte):
+    """Converte um stream binário com a lista JSON de contas num DataFrame tipado."""
+    rss_antes = _pico_rss_mb()
+    colunas = {
+        nome: _ColunaDicionario() if nome in COLUNAS_CATEGORICAS or nome == "Data" else _ColunaNumerica()
+        for nome in COLUNAS
+    }
+    anexadores = [(nome, colunas[nome].anexar) for nome in COLUNAS]
+
+    linhas = 0
+    for registro in ijson.items(fonte, "item", use_float=True):
+        obter = registro.get
+        for nome, anexar in anexadores:
+            anexar(obter(nome))
+        linhas += 1
+        if linhas % TAMANHO_BLOCO == 0:
+            for coluna in colunas.values():
+                coluna.fechar_bloco()
+    for coluna in colunas.values():
+        coluna.fechar_bloco()
+
+    df = _montar(colunas)
+    logger.info(
+        "ingestão de /contas: %d linhas, pico de RSS %.1f MB antes e %.1f MB depois",
+        linhas, rss_antes, _pico_rss_mb(),
+    )
+    return df
+
+
+def _coluna_arrow(tabela, nome, tipo):
+    if nome not in tabela.column_names:
+        return pa.nulls(tabela.num_rows, tipo)
+    return tabela.column(nome)
+
+
+def _datas_arrow(coluna):
+    if pa.types.is_timestamp(coluna.type) or pa.types.is_date(coluna.type):
+        # Mesma unidade das datas lidas do JSON, para os Parquet mensais terem um só schema
+        return coluna.cast(pa.timestamp("us")).to_pandas()
+    # Datas em texto (ex.: "Mon, 06 Jan 2025 00:00:00 GMT"): converte só os valores distintos
+    codificada = pc.dictionary_encode(coluna.cast(pa.string())).combine_chunks()
+    datas = pd.DatetimeIndex(
+        pd.to_datetime(pd.Series(codificada.dictionary.to_pandas(), dtype=object), errors="coerce")
+    ).append(pd.DatetimeIndex([pd.NaT]))
+    codigos = codificada.indices.fill_null(len(datas) - 1).to_numpy(zero_copy_only=False)
+    return datas[codigos]
+
+
+def de_arrow(tabela):
+    """DataFrame com os mesmos tipos de ``ler_contas`` a partir de uma tabela Arrow."""
+    dados = {}
+    for nome in COLUNAS_CATEGORICAS:
+        coluna = _coluna_arrow(tabela, nome, pa.string()).cast(pa.string())
+        dados[nome] = pc.dictionary_encode(coluna).combine_chunks().to_pandas()
+    for nome in COLUNAS_INTEIRAS:
+        coluna = _coluna_arrow(tabela, nome, pa.int64())
+        dados[nome] = coluna.cast(pa.float64()).fill_null(0).cast(pa.int64()).to_numpy()
+    dados["Data"] = _datas_arrow(_coluna_arrow(tabela, "Data", pa.timestamp("us")))
+    for nome in COLUNAS_VALOR:
+        coluna = _coluna_arrow(tabela, nome, pa.float64())
+        dados[nome] = np.nan_to_num(coluna.cast(pa.float64()).to_numpy(zero_copy_only=False), nan=0.0)
+    return pd.DataFrame(dados, columns=COLUNAS)
+
+
+def ler_arrow(fonte):
+    """Lê um stream Arrow IPC com as contas."""
+    return de_arrow(pa.ipc.open_stream(fonte).read_all())
+
+
+def ler_parquet(fonte):
+    """Lê um corpo Parquet com as contas (o Parquet precisa do arquivo inteiro)."""
+    return de_arrow(pq.read_table(pa.BufferReader(fonte.read())))
+
+
+LEITORES = {
+    TIPO_ARROW: ler_arrow,
+    TIPO_PARQUET: ler_parquet,
+    TIPO_JSON: ler_contas,
+}
+
+
+def accept_encoding():
+    """Compressões aceitas, zstd primeiro quando há como descomprimir."""
+    return "zstd, gzip" if HAS_ZSTD or zstandard is not None else "gzip"
+
+
+def cabecalhos():
+    """Cabeçalhos de negociação de formato e compressão para /contas."""
+    return {"Accept": ACCEPT, "Accept-Encoding": accept_encoding()}
+
+
+def _corpo(response):
+    # O urllib3 descomprime gzip (e zstd quando tem suporte); o resto fica com o zstandard
+    if response.headers.get("Content-Encoding", "").strip().lower() == "zstd" and not HAS_ZSTD:
+        response.raw.decode_content = False
+        return zstandard.ZstdDecompressor().stream_reader(response.raw, read_across_frames=True)
+    response.raw.decode_content = True
+    return response.raw
+
+
+def _erros_corpo():
+    # Lido por ``response.raw``, o corpo não passa pelo tratamento de erros do
+    # requests: conexão cortada, timeout, corpo truncado ou mal formado
+    erros = (urllib3.exceptions.HTTPError, ijson.JSONError, pa.ArrowInvalid)
+    return erros + (zstandard.ZstdError,) if zstandard is not None else erros
+
+
+def ler_resposta(response):
+    """Lê uma resposta do requests aberta com ``stream=True``, no formato que ela declarar.
+
+    Falhas ao ler o corpo viram ``requests.exceptions.ChunkedEncodingError``,
+    como aconteceria com ``response.content``.
+    """
+    tipo = response.headers.get("Content-Type", TIPO_JSON).split(";")[0].strip().lower()
+    ler = LEITORES.get(tipo, ler_contas)
+    logger.info("/contas em %s (%s)", tipo, response.headers.get("Content-Encoding", "sem compressão"))
+    try:
+        return ler(_corpo(response))
+    except _erros_corpo() as erro:
+        raise requests.exceptions.ChunkedEncodingError(f"Corpo de /contas incompleto ou inválido: {erro}") from erro
+
+
+def _pico_rss_mb():
+    if resource is None:
+        return math.nan
+    # ru_maxrss vem em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def comparar_memoria(caminho):
+    """Pico de memória alocada (MB) pela leitura antiga e pela leitura em streaming."""
+    def pico(funcao):
+        tracemalloc.start()
+        try:
+            funcao()
+            return tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    def antiga():
+        with open(caminho, "rb") as arquivo:
+            pd.DataFrame(json.load(arquivo))
+
+    def streaming():
+        with open(caminho, "rb") as arquivo:
+            ler_contas(arquivo)
+
+    return {"json_dataframe_mb": pico(antiga), "streaming_mb": pico(streaming)}
+
+
+if __name__ == "__main__":
+    resultado = comparar_memoria(sys.argv[1])
+    print(f"Pico com response.json() + DataFrame: {resultado['json_dataframe_mb']:.1f} MB")
+    print(f"Pico com leitura em streaming:        {resultado['streaming_mb']:.1f} MB")
@@ -0,0 +1,203 @@
+"""Pré-cálculo em lote dos quadros mais acessados, em paralelo.
+
+A maior parte dos acessos abre cada Empresa (ou todas) no mês corrente e no
+anterior, sem outros filtros. ``precalcular`` calcula os quadros das duas
+páginas (``painel.relatorios``) para essas combinações num pool de processos
+e grava um arquivo por combinação e seção (``relatorios.SECOES``) em
+``DIRETORIO_LOTE/<AAAA-MM>-<versão>/``. A versão de cada mês junta a do
+arquivo do mês no armazenamento e, nas seções que usam metas, a da planilha
+de metas: uma sincronização que reescreve só o mês corrente não
+invalida o mês anterior, e um snapshot novo nunca usa resultados antigos. As
+páginas procuram ali primeiro (``carregar``) e só calculam ao vivo as
+combinações incomuns.
+
+``precalcular`` só calcula o que falta, então pode rodar depois de cada
+sincronização: o ``Atualizador`` chama ``atualizar`` ao publicar um snapshot
+novo (já fora da trava), e o mês reescrito volta ao lote em seguida.
+
+Uso: ``python -m painel.lote [--processos N]`` (a primeira vez, ou num cron).
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import pickle
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from urllib.parse import quote
+
+import pandas as pd
+
+from painel import metas, relatorios, schema, sync
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_LOTE = os.path.join(sync.DIRETORIO_DADOS, "relatorios")
+PAGINAS = {
+    "parceiros": relatorios.parceiros,
+    "categorias": relatorios.categorias,
+}
+# Processos do pool quando o pré-cálculo roda dentro do app, depois de uma sincronização
+PROCESSOS_APP = int(os.environ.get("PAINEL_LOTE_PROCESSOS", "2"))
+
+# Muda quando o formato dos quadros de painel.relatorios muda (arquivos antigos não servem)
+FORMATO = 3
+
+# Contexto de cada processo do pool, montado uma vez no initializer
+_contexto = None
+
+
+def versao(versao_mes, versao_metas=None):
+    """Chave dos resultados de um mês: versão do arquivo do mês + início do sha256 das metas.
+
+    ``versao_metas`` é ``None`` nas seções que não usam as metas.
+    """
+    metas_ = "sem-metas" if versao_metas is None else versao_metas[:12]
+    return f"{versao_mes}-{metas_}-f{FORMATO}"
+
+
+def periodos(hoje=None):
+    """(Ano, Mes) do mês corrente e do anterior."""
+    hoje = hoje or date.today()
+    anterior = (hoje.year - 1, 12) if hoje.month == 1 else (hoje.year, hoje.month - 1)
+    return [(hoje.year, hoje.month), anterior]
+
+
+def chave(selecoes):
+    """(Empresa ou None, Ano, Mes) quando ``selecoes`` é uma combinação pré-calculável.
+
+    Pré-calculáveis são: uma empresa ou todas, um ano e um mês, e nenhum outro
+    filtro (Dia/Categoria em "Todos"). Para o resto devolve ``None``.
+    """
+    empresa, ano, mes = selecoes.get("Empresa"), selecoes.get("Ano"), selecoes.get("Mes")
+    outros = [valores for coluna, valores in selecoes.items() if coluna not in ("Empresa", "Ano", "Mes")]
+    if any(valores is not None for valores in outros):
+        return None
+    if empresa is not None and len(empresa) != 1:
+        return None
+    if ano is None or mes is None or len(ano) != 1 or len(mes) != 1:
+        return None
+    return (None if empresa is None else str(empresa[0]), int(ano[0]), int(mes[0]))
+
+
+def _selecoes(pagina, empresa, ano, mes):
+    outra = "Dia" if pagina == "parceiros" else "Categoria"
+    return {"Empresa": None if empresa is None else [empresa], "Ano": [ano], "Mes": [mes], outra: None}
+
+
+def _diretorio(versao_lote, ano, mes):
+    return os.path.join(DIRETORIO_LOTE, f"{ano:04d}-{mes:02d}-{versao_lote}")
+
+
+def _arquivo(versao_lote, pagina, secao, empresa, ano, mes):
+    nome = "Todos" if empresa is None else quote(empresa, safe="")
+    return os.path.join(_diretorio(versao_lote, ano, mes), f"{pagina}-{secao}-{nome}.pkl")
+
+
+def carregar(versoes_meses, pagina, secao, selecoes, versao_metas=None):
+    """Resultado pré-calculado da ``secao`` para ``selecoes`` ou ``None`` (fora do lote).
+
+    ``versoes_meses`` é a versão de cada mês no snapshot em uso
+    (``sync.versoes_meses``); ``versao_metas`` só conta nas seções que usam metas.
+    """
+    combinacao = chave(selecoes)
+    if combinacao is None:
+        return None
+    empresa, ano, mes = combinacao
+    versao_mes = versoes_meses.get(sync._chave_mes(ano, mes))
+    if versao_mes is None or (relatorios.usa_metas(pagina, secao) and versao_metas is None):
+        return None
+    versao_lote = versao(versao_mes, versao_metas if relatorios.usa_metas(pagina, secao) else None)
+    caminho = _arquivo(versao_lote, pagina, secao, empresa, ano, mes)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, "rb") as arquivo:
+        return pickle.load(arquivo)
+
+
+def _iniciar_processo(arquivos, metas_diarias):
+    # Cada combinação é de um mês só: bastam os arquivos dos meses a calcular.
+    # Os processos começam do zero (spawn), então caminhos e metas vêm prontos do pai.
+    global _contexto
+    data = schema.normalizar(pd.concat([pd.read_parquet(arquivo) for arquivo in arquivos], ignore_index=True))
+    _contexto = relatorios.Contexto.montar(data, metas_diarias)
+
+
+def _calcular(tarefa):
+    destino, pagina, secao, empresa, ano, mes = tarefa
+    resultado = relatorios.secao(pagina, secao, _contexto, _selecoes(pagina, empresa, ano, mes))
+    sync._gravar_atomico(destino, lambda caminho: _dump_pickle(resultado, caminho))
+    return destino
+
+
+def _dump_pickle(obj, caminho):
+    with open(caminho, "wb") as arquivo:
+        pickle.dump(obj, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def precalcular(processos=None, hoje=None):
+    """Calcula as combinações Empresa × período × seção que faltam no lote e descarta as antigas.
+
+    Só os meses cujo arquivo mudou desde o último pré-cálculo são calculados de
+    novo. Não precisa da ``snapshot.trava``: um mês reescrito no meio só deixa
+    resultados sob a versão antiga do mês, que o snapshot seguinte não procura. Os
+    processos do pool são criados com "spawn" (sem herdar travas de outras
+    threads do app) e recebem as metas já carregadas. Devolve os arquivos gravados.
+    """
+    versoes = sync.versoes_meses()
+    versao_metas = metas.versao()
+    tarefas = []
+    vigentes = set()
+    for ano, mes in periodos(hoje):
+        versao_mes = versoes.get(sync._chave_mes(ano, mes))
+        if versao_mes is None:
+            continue
+        empresas = sorted(sync.ler_store(["Empresa"], meses=[(ano, mes)])["Empresa"].unique().tolist())
+        for pagina in PAGINAS:
+            for secao in relatorios.SECOES[pagina]:
+                versao_lote = versao(versao_mes, versao_metas if relatorios.usa_metas(pagina, secao) else None)
+                diretorio = _diretorio(versao_lote, ano, mes)
+                vigentes.add(os.path.basename(diretorio))
+                os.makedirs(diretorio, exist_ok=True)
+                tarefas += [
+                    (_arquivo(versao_lote, pagina, secao, empresa, ano, mes), pagina, secao, empresa, ano, mes)
+                    for empresa in [None] + empresas
+                    if not os.path.exists(_arquivo(versao_lote, pagina, secao, empresa, ano, mes))
+                ]
+
+    gravados = []
+    if tarefas:
+        arquivos = sorted({sync._arquivo_mes(ano, mes) for *_, ano, mes in tarefas})
+        # As metas são carregadas (e o cache delas refeito, se preciso) uma vez, aqui
+        with ProcessPoolExecutor(
+            max_workers=processos, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_iniciar_processo, initargs=(arquivos, metas.carregar()),
+        ) as pool:
+            gravados = list(pool.map(_calcular, tarefas))
+
+    if os.path.isdir(DIRETORIO_LOTE):
+        for nome in os.listdir(DIRETORIO_LOTE):
+            if nome not in vigentes:
+                shutil.rmtree(os.path.join(DIRETORIO_LOTE, nome), ignore_errors=True)
+    logger.info("lote: %d combinações pré-calculadas (%s)", len(gravados), ", ".join(sorted(vigentes)))
+    return gravados
+
+
+def atualizar():
+    """Completa o lote depois de um snapshot novo, se o lote estiver em uso neste host."""
+    if os.path.isdir(DIRETORIO_LOTE):
+        precalcular(PROCESSOS_APP)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-calcula os quadros por Empresa × mês.")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: número de CPUs")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    gravados = precalcular(args.processos)
+    print(f"{len(gravados)} combinações gravadas em {DIRETORIO_LOTE}")
+
+
+if __name__ == "__main__":
+    main()
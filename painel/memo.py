@@ -0,0 +1,93 @@
+"""Memória LRU dos quadros das páginas por versão dos dados e filtros.
+
+Cada interação reexecuta a página inteira, e os usuários alternam entre poucos
+conjuntos de filtros. Os quadros de ``painel.relatorios`` ficam guardados aqui
+com a chave (página, versão dos dados, versão das metas, filtros normalizados);
+repetir uma visão, ou abrir a mesma visão em outra sessão, não recalcula nada.
+A memória tem limite de itens (``MAX_ITENS``) e de bytes estimados
+(``MAX_BYTES``); ao passar deles saem os menos usados recentemente.
+
+Os resultados são compartilhados entre sessões: as páginas não podem alterá-los.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from painel import api, metricas
+from painel.registro import tamanho
+
+MAX_ITENS = int(os.environ.get("PAINEL_MEMO_ITENS", "256"))
+MAX_BYTES = int(os.environ.get("PAINEL_MEMO_MB", "256")) * 1024 * 1024
+
+
+def normalizar(selecoes):
+    """Filtros como tupla ordenada e hashable (a ordem dos valores escolhidos não importa)."""
+    return tuple(
+        (coluna, None if valores is None else tuple(sorted(valores, key=str)))
+        for coluna, valores in sorted(selecoes.items())
+    )
+
+
+def tamanho_resultado(resultado):
+    """Bytes estimados de um resultado (dicionários de tabelas e números)."""
+    if isinstance(resultado, dict):
+        return sum(tamanho_resultado(valor) for valor in resultado.values())
+    return tamanho(resultado)
+
+
+class Memo:
+    def __init__(self, nome, max_itens=MAX_ITENS, max_bytes=MAX_BYTES):
+        self.nome = nome
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        # chave -> (resultado, bytes), do menos para o mais recentemente usado
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave, calcular):
+        """Resultado de ``chave``, calculado por ``calcular()`` só na primeira vez."""
+        with self._lock:
+            entrada = self._itens.get(chave)
+            if entrada is not None:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+            else:
+                self.falhas += 1
+        metricas.cache(self.nome, entrada is not None)
+        if entrada is not None:
+            return entrada[0]
+        # Sessões com a mesma visão ao mesmo tempo esperam um único cálculo
+        resultado = api.voo_unico((self.nome, chave), calcular)
+        with self._lock:
+            if chave not in self._itens:
+                bytes_ = tamanho_resultado(resultado)
+                self._itens[chave] = (resultado, bytes_)
+                self._bytes += bytes_
+                self._descartar()
+        return resultado
+
+    def _descartar(self):
+        # O item mais recente fica mesmo se sozinho passar do limite de bytes
+        while len(self._itens) > self.max_itens or (len(self._itens) > 1 and self._bytes > self.max_bytes):
+            _, (_, bytes_) = self._itens.popitem(last=False)
+            self._bytes -= bytes_
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+    def uso(self):
+        """Itens, bytes estimados e taxa de acerto, para diagnóstico."""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "bytes": self._bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
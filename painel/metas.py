@@ -0,0 +1,80 @@
+"""Metas diárias lidas da planilha, com cópia binária (Arrow IPC) em disco.
+
+Ler o xlsx com openpyxl é lento e se repetia a cada processo novo. A planilha é
+convertida uma vez para ``ARQUIVO_CACHE`` (Arrow sem compressão, que pode ser
+mapeado em memória) com ``Meta_Diária`` já numérica; ao lado fica a impressão
+digital da planilha (mtime, tamanho e sha256). Enquanto ela não muda, as cargas
+seguintes só mapeiam o arquivo Arrow.
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from painel import metricas, sync
+
+ARQUIVO_METAS = os.environ.get("PAINEL_METAS", "./Metas_Ajustadas_Sem_Domingos_Gatzz.xlsx")
+ARQUIVO_CACHE = os.path.join(sync.DIRETORIO_DADOS, "metas.arrow")
+ARQUIVO_IMPRESSAO = os.path.join(sync.DIRETORIO_DADOS, "metas.json")
+
+
+def _sha256(caminho):
+    resumo = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def _ler_impressao():
+    if not os.path.exists(ARQUIVO_IMPRESSAO) or not os.path.exists(ARQUIVO_CACHE):
+        return None
+    with open(ARQUIVO_IMPRESSAO, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def impressao():
+    """Impressão digital atual da planilha, reaproveitando o sha256 gravado.
+
+    O hash só é recalculado quando mtime ou tamanho mudaram; se o conteúdo
+    continuar o mesmo (arquivo apenas tocado/copiado), o cache segue válido.
+    """
+    estado = os.stat(ARQUIVO_METAS)
+    atual = {"mtime_ns": estado.st_mtime_ns, "tamanho": estado.st_size}
+    gravada = _ler_impressao()
+    if gravada and all(gravada.get(chave) == valor for chave, valor in atual.items()):
+        return gravada
+    atual["sha256"] = _sha256(ARQUIVO_METAS)
+    return atual
+
+
+def _converter(destino):
+    metas = pd.read_excel(ARQUIVO_METAS, sheet_name="Sheet1")
+    metas["Meta_Diária"] = pd.to_numeric(metas["Meta_Diária"], errors="coerce").fillna(0)
+    # Sem compressão, para que a leitura possa mapear o arquivo em memória
+    feather.write_feather(metas, destino, compression="uncompressed")
+
+
+def carregar():
+    """Metas diárias; ``attrs["versao"]`` traz o sha256 da planilha de origem."""
+    atual = impressao()
+    gravada = _ler_impressao()
+    os.makedirs(sync.DIRETORIO_DADOS, exist_ok=True)
+    reconstruir = gravada is None or gravada.get("sha256") != atual["sha256"]
+    metricas.cache("metas.arrow", not reconstruir)
+    if reconstruir:
+        sync._gravar_atomico(ARQUIVO_CACHE, _converter)
+    if gravada != atual:
+        sync._gravar_atomico(ARQUIVO_IMPRESSAO, lambda caminho: sync._dump_json(atual, caminho))
+    with pa.memory_map(ARQUIVO_CACHE, "r") as fonte:
+        metas = pa.ipc.open_file(fonte).read_all().to_pandas()
+    metas.attrs["versao"] = atual["sha256"]
+    return metas
+
+
+def versao():
+    """Versão das metas (sha256 da planilha), chave dos caches derivados."""
+    return impressao()["sha256"]
@@ -0,0 +1,160 @@
+"""Tempos por seção, contadores de cache e exportação em JSON-lines.
+
+Cada medição é um dicionário ``{"ts", "secao", "ms", ...}`` com informações
+extras (linhas, bytes, acerto de cache). As medições ficam num buffer do
+processo, de onde sai o p50/p95 do painel de administração, e são anexadas a
+``ARQUIVO_METRICAS`` para acompanhar a evolução entre versões
+(``python -m painel.metricas`` resume o arquivo). Passando de
+``TAMANHO_MAX_ARQUIVO`` o arquivo vira ``<arquivo>.1`` (o anterior é
+descartado) e um novo é começado.
+
+Nas bibliotecas use ``with secao("nome") as info: ... info["linhas"] = n``;
+nas páginas, que são scripts lineares, ``Execucao.marcar("nome")`` fecha a
+seção anterior e abre a próxima sem reindentar o código.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Mesmo diretório de painel.sync (sem importá-lo: o cliente HTTP usa este módulo)
+ARQUIVO_METRICAS = os.environ.get(
+    "PAINEL_METRICAS", os.path.join(os.environ.get("PAINEL_DADOS", "./dados"), "metricas.jsonl")
+)
+TAMANHO_BUFFER = 5000
+TAMANHO_MAX_ARQUIVO = int(os.environ.get("PAINEL_METRICAS_MB", "50")) * 1024 * 1024
+
+_buffer = deque(maxlen=TAMANHO_BUFFER)
+_cache = Counter()
+_lock = threading.Lock()
+# Execução (rerun de página) em andamento nesta thread, se houver
+_local = threading.local()
+
+
+def registrar(medicao):
+    """Guarda ``medicao`` no buffer do processo, na execução atual e no arquivo."""
+    medicao.setdefault("ts", time.time())
+    execucao = getattr(_local, "execucao", None)
+    if execucao is not None:
+        medicao.setdefault("pagina", execucao.pagina)
+        execucao.medicoes.append(medicao)
+    with _lock:
+        _buffer.append(medicao)
+        try:
+            os.makedirs(os.path.dirname(ARQUIVO_METRICAS) or ".", exist_ok=True)
+            with open(ARQUIVO_METRICAS, "a", encoding="utf-8") as arquivo:
+                arquivo.write(json.dumps(medicao, ensure_ascii=False, default=str) + "\n")
+                tamanho = arquivo.tell()
+            if tamanho > TAMANHO_MAX_ARQUIVO:
+                os.replace(ARQUIVO_METRICAS, ARQUIVO_METRICAS + ".1")
+        except OSError:
+            # Métrica nunca derruba a página
+            pass
+
+
+@contextmanager
+def secao(nome, **info):
+    """Mede o bloco; o dicionário devolvido aceita informações extras (linhas, bytes...)."""
+    inicio = time.perf_counter()
+    try:
+        yield info
+    finally:
+        registrar({"secao": nome, "ms": (time.perf_counter() - inicio) * 1000, **info})
+
+
+def medir_cache(nome, funcao, *args, **kwargs):
+    """Chama uma função com ``st.cache_*`` e conta acerto/falha do cache.
+
+    A função cacheada chama ``falha_cache(nome)`` no corpo, que só roda na falha.
+    """
+    _local.falhas = getattr(_local, "falhas", set())
+    _local.falhas.discard(nome)
+    resultado = funcao(*args, **kwargs)
+    cache(nome, nome not in _local.falhas)
+    return resultado
+
+
+def falha_cache(nome):
+    getattr(_local, "falhas", set()).add(nome)
+
+
+def cache(nome, acerto):
+    """Conta um acerto ou falha do cache ``nome``."""
+    with _lock:
+        _cache[(nome, bool(acerto))] += 1
+    registrar({"secao": f"cache {nome}", "ms": 0.0, "acerto": bool(acerto)})
+
+
+class Execucao:
+    """Seções sequenciais de um rerun de página (``marcar`` fecha a anterior)."""
+
+    def __init__(self, pagina):
+        self.pagina = pagina
+        self.medicoes = []
+        self._aberta = None
+        self._inicio = time.perf_counter()
+        _local.execucao = self
+
+    def marcar(self, nome, **info):
+        self._fechar()
+        self._aberta = (nome, info, time.perf_counter())
+
+    def anotar(self, **info):
+        """Acrescenta informações (linhas, por exemplo) à seção aberta."""
+        if self._aberta is not None:
+            self._aberta[1].update(info)
+
+    def _fechar(self):
+        if self._aberta is not None:
+            nome, info, inicio = self._aberta
+            self._aberta = None
+            registrar({"secao": f"{self.pagina}.{nome}", "ms": (time.perf_counter() - inicio) * 1000, **info})
+
+    def fim(self):
+        self._fechar()
+        registrar({"secao": f"{self.pagina}.total", "ms": (time.perf_counter() - self._inicio) * 1000})
+        _local.execucao = None
+        return self.medicoes
+
+
+def percentis(medicoes=None):
+    """p50/p95 (ms) e número de medições por seção."""
+    if medicoes is None:
+        with _lock:
+            medicoes = list(_buffer)
+    tempos = {}
+    for medicao in medicoes:
+        tempos.setdefault(medicao["secao"], []).append(medicao["ms"])
+    return {
+        nome: {"n": len(valores), "p50_ms": float(np.percentile(valores, 50)), "p95_ms": float(np.percentile(valores, 95))}
+        for nome, valores in sorted(tempos.items())
+        if not nome.startswith("cache ")
+    }
+
+
+def acertos_cache():
+    """{cache: (acertos, falhas)} desde o início do processo."""
+    with _lock:
+        nomes = {nome for nome, _ in _cache}
+        return {nome: (_cache[(nome, True)], _cache[(nome, False)]) for nome in sorted(nomes)}
+
+
+def ler_arquivo(caminho=None):
+    """Medições gravadas em ``caminho`` (padrão: o arquivo rotacionado e o atual)."""
+    caminhos = [caminho] if caminho else [ARQUIVO_METRICAS + ".1", ARQUIVO_METRICAS]
+    medicoes = []
+    for caminho in caminhos:
+        if os.path.exists(caminho):
+            with open(caminho, encoding="utf-8") as arquivo:
+                medicoes += [json.loads(linha) for linha in arquivo if linha.strip()]
+    return medicoes
+
+
+if __name__ == "__main__":
+    for nome, valores in percentis(ler_arquivo(*sys.argv[1:])).items():
+        print(f"{nome:<40} n={valores['n']:<6} p50={valores['p50_ms']:9.1f} ms  p95={valores['p95_ms']:9.1f} ms")
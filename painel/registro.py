@@ -0,0 +1,66 @@
+"""Estruturas derivadas do snapshot (cubo, índices) compartilhadas pelo processo.
+
+Todas as sessões usam o mesmo snapshot somente leitura (com copy-on-write do
+pandas ninguém altera o DataFrame compartilhado) e as mesmas estruturas
+derivadas dele, guardadas aqui por versão do snapshot. O registro tem limite
+explícito: no máximo ``MAX_VERSOES`` versões e ``MAX_BYTES`` estimados; ao
+passar disso as versões mais antigas são descartadas inteiras.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from painel import api, metricas
+
+MAX_VERSOES = int(os.environ.get("PAINEL_MAX_VERSOES", "2"))
+MAX_BYTES = int(os.environ.get("PAINEL_MEMORIA_DERIVADOS_MB", "512")) * 1024 * 1024
+
+
+def tamanho(objeto):
+    """Bytes estimados de ``objeto`` (DataFrame ou estrutura com ``memoria()``)."""
+    if isinstance(objeto, pd.DataFrame):
+        return int(objeto.memory_usage(index=True).sum())
+    if hasattr(objeto, "memoria"):
+        return int(objeto.memoria())
+    return 0
+
+
+class Registro:
+    def __init__(self, max_versoes=MAX_VERSOES, max_bytes=MAX_BYTES):
+        self.max_versoes = max_versoes
+        self.max_bytes = max_bytes
+        # versao -> {chave: (objeto, bytes)}, da mais antiga para a mais recente
+        self._versoes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, versao, chave, construir):
+        """Objeto ``chave`` da ``versao``, construído uma única vez por ``construir()``."""
+        with self._lock:
+            entrada = self._versoes.get(versao, {}).get(chave)
+        metricas.cache(f"registro {chave[0]}", entrada is not None)
+        if entrada is not None:
+            return entrada[0]
+        # Sessões simultâneas esperam a mesma construção em vez de repeti-la
+        objeto = api.voo_unico(("registro", versao, chave), construir)
+        with self._lock:
+            self._versoes.setdefault(versao, {})[chave] = (objeto, tamanho(objeto))
+            self._versoes.move_to_end(versao)
+            self._descartar()
+        return objeto
+
+    def _descartar(self):
+        # A versão mais recente nunca é descartada, mesmo acima do limite de bytes
+        while len(self._versoes) > self.max_versoes or (
+            len(self._versoes) > 1 and self._bytes() > self.max_bytes
+        ):
+            self._versoes.popitem(last=False)
+
+    def _bytes(self):
+        return sum(bytes_ for objetos in self._versoes.values() for _, bytes_ in objetos.values())
+
+    def uso(self):
+        """Versões guardadas e bytes estimados, para diagnóstico."""
+        with self._lock:
+            return {"versoes": list(self._versoes), "bytes": self._bytes()}
@@ -0,0 +1,310 @@
+"""Quadros numéricos das páginas, calculados fora do Streamlit.
+
+Cada função recebe o ``Contexto`` (snapshot, cubo, índices e metas) e as
+seleções da sidebar e devolve as tabelas ainda numéricas; formatar e exibir
+fica com as páginas. Assim a mesma conta serve para a página ao vivo, para o
+pré-cálculo em lote (``painel.lote``) e para os benchmarks.
+"""
+from dataclasses import dataclass
+from datetime import date
+
+import pandas as pd
+
+from painel import comparativo, graficos
+from painel.cartoes import resumo_categorias_principais
+from painel.cubo import Cubo
+from painel.indice import IndiceFiltro
+from painel.schema import MESES
+
+PRINCIPAIS = ["Venda própria", "Laçador", "Tche", "Prime"]
+SECUNDARIAS = ["Bebidas", "Souvenir", "Cozinha", "Extras"]
+COLUNAS_FILTRO = ["Empresa", "Ano", "Mes", "Dia"]
+COLUNAS_FILTRO_METAS = ["Empresa", "Ano", "Mês", "Dia"]
+
+# Comparações com outro período oferecidas em pages/Categorias.py (rótulo -> modo)
+COMPARACOES = {
+    "Mês anterior": "mes",
+    "Ano anterior": "ano",
+}
+
+# Layouts de blocos de dias oferecidos no quadro de Metas x Realizado
+BLOCOS_DIAS = {
+    "Padrão": comparativo.BLOCOS_PADRAO,
+    "Semanas": comparativo.SEMANAS,
+}
+
+
+@dataclass
+class Contexto:
+    data: pd.DataFrame
+    cubo: Cubo
+    indice: IndiceFiltro
+    # Só o quadro de Metas x Realizado (Parceiros) usa as metas
+    metas: pd.DataFrame = None
+    indice_metas: IndiceFiltro = None
+
+    @classmethod
+    def montar(cls, data, metas):
+        """Monta cubo e índices diretamente (fora do registro das páginas)."""
+        return cls(
+            data, Cubo(data), IndiceFiltro(data, COLUNAS_FILTRO),
+            metas, IndiceFiltro(metas, COLUNAS_FILTRO_METAS),
+        )
+
+
+def selecoes_metas(selecoes):
+    """Seleções de contas (Mes numérico) traduzidas para as colunas da planilha de metas."""
+    meses = selecoes.get("Mes")
+    return {
+        "Empresa": selecoes.get("Empresa"),
+        "Ano": selecoes.get("Ano"),
+        "Mês": None if meses is None else [MESES[mes] for mes in meses],
+        "Dia": selecoes.get("Dia"),
+    }
+
+
+def _pivot_por_dia(vendas, medida):
+    tabela = vendas.pivot_table(
+        index=["Categoria"], columns="Dia", values=medida, aggfunc="sum",
+        observed=True, margins=True, margins_name="Total",
+    ).fillna(0)
+    tabela.columns = tabela.columns.map(str)
+    return tabela
+
+
+def cards(contexto, selecoes, vendas):
+    """Total geral e resumo dos cards das categorias principais (painel.cartoes)."""
+    linhas = contexto.indice.filtrar(contexto.data, selecoes)
+    total_geral = vendas[vendas["Categoria"].isin(PRINCIPAIS + SECUNDARIAS)][["TotalLiq", "servico"]].sum().sum()
+    resumo, subcategorias = resumo_categorias_principais(linhas, PRINCIPAIS, SECUNDARIAS)
+    return {"total_geral": total_geral, "resumo": resumo, "subcategorias": subcategorias}
+
+
+def realizado_por_dia(vendas):
+    """Pivots Categoria × Dia (QTD e TotalLiq) das principais, com totais."""
+    principais = vendas[vendas["Categoria"].isin(PRINCIPAIS)]
+    return {
+        "realizado_qtd": _pivot_por_dia(principais, "QTD"),
+        "realizado_valor": _pivot_por_dia(principais, "TotalLiq"),
+    }
+
+
+def metas_x_realizado(contexto, selecoes, vendas):
+    """Metas x Realizado (numérico) para cada layout de ``BLOCOS_DIAS``."""
+    metas = contexto.indice_metas.filtrar(contexto.metas, selecoes_metas(selecoes))
+    metas = metas[metas["Categoria"].isin(PRINCIPAIS)]
+    principais = vendas[vendas["Categoria"].isin(PRINCIPAIS)]
+    return {
+        "comparativo": {
+            nome: comparativo.metas_x_realizado(metas, principais, inicios)
+            for nome, inicios in BLOCOS_DIAS.items()
+        }
+    }
+
+
+def parceiros(contexto, selecoes):
+    """Todos os quadros de Parceiros.py para ``selecoes`` (Empresa, Ano, Mes, Dia)."""
+    return _pagina("parceiros", contexto, selecoes)
+
+
+def resumo_categorias(vendas, anterior=None):
+    """Quantidade, Total e % de participação por categoria, com a linha de total.
+
+    Com ``anterior`` (vendas do período de comparação) acrescenta o "Total
+    anterior" e a variação ("Δ %") de cada categoria e do total.
+    """
+    resumo = vendas.groupby("Categoria", observed=True).agg(
+        Quantidade=("QTD", "sum"),
+        Total=("TotalLiq", "sum"),
+    )
+    if anterior is not None:
+        # Categorias vendidas só em um dos períodos aparecem com zero no outro
+        anteriores = anterior.groupby("Categoria", observed=True)["TotalLiq"].sum().rename("Total anterior")
+        resumo = resumo.join(anteriores, how="outer").fillna(0)
+    resumo = resumo.reset_index()
+    if resumo["Total"].sum() > 0:
+        resumo["% Part"] = resumo["Total"] / resumo["Total"].sum() * 100
+    else:
+        resumo["% Part"] = 0
+    total = pd.DataFrame({
+        "Categoria": ["Total"],
+        "Quantidade": [resumo["Quantidade"].sum()],
+        "Total": [resumo["Total"].sum()],
+        "% Part": [100.0],
+    })
+    if anterior is not None:
+        total["Total anterior"] = resumo["Total anterior"].sum()
+    resumo = pd.concat([resumo, total], ignore_index=True)
+    if anterior is not None:
+        resumo = resumo[["Categoria", "Quantidade", "Total", "% Part", "Total anterior"]]
+        resumo = resumo.assign(**{"Δ %": variacao(resumo["Total"], resumo["Total anterior"])})
+    return resumo
+
+
+def pivots_categorias(vendas):
+    """Pivots Categoria × Dia de QTD e TotalLiq de todas as categorias, com totais."""
+    return {
+        f"pivot_{nome}": vendas.pivot_table(
+            index="Categoria", columns="Dia", values=medida, aggfunc="sum",
+            observed=True, margins=True, margins_name="Total", fill_value=0,
+        )
+        for nome, medida in [("qtd", "QTD"), ("total", "TotalLiq")]
+    }
+
+
+def graficos_categorias(vendas):
+    """Dados (formato longo) dos gráficos de tendência por data e por dia da semana."""
+    tendencia, resolucao = graficos.tendencia(vendas)
+    return {
+        "tendencia": tendencia,
+        "resolucao": resolucao,
+        "semana": graficos.por_dia_semana(vendas),
+    }
+
+
+def periodos(selecoes):
+    """(Ano, Mes) selecionados, todos os meses quando Mes é "Todos"; ``None`` se Ano é "Todos"."""
+    if selecoes.get("Ano") is None:
+        return None
+    # Nenhum mês escolhido (lista vazia) é nenhum período, não o ano inteiro
+    meses = selecoes.get("Mes")
+    if meses is None:
+        meses = range(1, 13)
+    return sorted((int(ano), int(mes)) for ano in selecoes["Ano"] for mes in meses)
+
+
+def periodos_anteriores(atuais, modo):
+    """Períodos de comparação de ``atuais`` (``modo`` de ``COMPARACOES``).
+
+    "ano" é o mesmo mês do ano anterior; "mes" recua o tamanho da seleção
+    (um mês recua um mês, o trimestre volta ao trimestre anterior).
+    """
+    if not atuais:
+        return []
+    indices = [ano * 12 + mes - 1 for ano, mes in atuais]
+    recuo = 12 if modo == "ano" else max(indices) - min(indices) + 1
+    return [((indice - recuo) // 12, (indice - recuo) % 12 + 1) for indice in indices]
+
+
+def comparacoes(selecoes):
+    """Rótulos de ``COMPARACOES`` que fazem sentido para ``selecoes``.
+
+    Com todos os meses a seleção já é o ano inteiro, e recuar o tamanho dela
+    daria a mesma comparação que o ano anterior.
+    """
+    return [rotulo for rotulo, modo in COMPARACOES.items() if modo != "mes" or selecoes.get("Mes") is not None]
+
+
+def periodos_comparacao(selecoes, modo, hoje=None):
+    """(atuais, anteriores, até o dia) de uma comparação, no mesmo trecho de tempo.
+
+    Meses depois de ``hoje`` ainda não têm contas e ficam de fora; se o mês de
+    ``hoje`` está entre os atuais, ele e o mês correspondente do período de
+    comparação contam só até o dia de hoje (até o dia é ``None`` caso contrário).
+    """
+    hoje = hoje or date.today()
+    mes_atual = (hoje.year, hoje.month)
+    atuais = periodos(selecoes)
+    atuais = [periodo for periodo in atuais if periodo <= mes_atual] or atuais
+    anteriores = periodos_anteriores(atuais, modo)
+    return atuais, anteriores, hoje.day if mes_atual in atuais else None
+
+
+def variacao(atual, anterior):
+    """Variação % de ``anterior`` para ``atual`` (ausente quando o anterior é zero)."""
+    return (atual / anterior.where(anterior != 0) - 1) * 100
+
+
+def comparacao_categorias(contexto, selecoes, modo, hoje=None):
+    """Totais e resumo por categoria do período selecionado e do período de comparação.
+
+    Os dois períodos saem de uma única agregação do cubo por (Ano, Mes,
+    Categoria) sobre a união deles, separada depois pelos meses de cada um.
+    Com o mês corrente selecionado, os dois contam só até o dia de hoje
+    (``periodos_comparacao``).
+    """
+    atuais, anteriores, ate_dia = periodos_comparacao(selecoes, modo, hoje)
+    todos = set(atuais) | set(anteriores)
+    uniao = {
+        **selecoes,
+        "Ano": sorted({ano for ano, _ in todos}),
+        "Mes": sorted({mes for _, mes in todos}),
+    }
+    vendas = contexto.cubo.filtrar(uniao)
+    if ate_dia is not None:
+        # O mês corrente é o último dos atuais; ele e o seu correspondente
+        # contam só os dias já decorridos
+        parciais = [ano * 12 + mes - 1 for ano, mes in (atuais[-1], anteriores[-1])]
+        mes_vendas = vendas["Ano"] * 12 + vendas["Mes"] - 1
+        vendas = vendas[~(mes_vendas.isin(parciais) & (vendas["Dia"] > ate_dia))]
+    somas = vendas.groupby(
+        ["Ano", "Mes", "Categoria"], observed=True, sort=False,
+    )[["QTD", "TotalLiq", "servico"]].sum().reset_index()
+    # Ano × Mes da união traz meses que não são de nenhum dos dois períodos
+    chave = somas["Ano"] * 12 + somas["Mes"] - 1
+    atual = somas[chave.isin([ano * 12 + mes - 1 for ano, mes in atuais])]
+    anterior = somas[chave.isin([ano * 12 + mes - 1 for ano, mes in anteriores])]
+    totais = pd.DataFrame({
+        "atual": atual[["TotalLiq", "servico"]].sum(),
+        "anterior": anterior[["TotalLiq", "servico"]].sum(),
+    })
+    totais["variacao"] = variacao(totais["atual"], totais["anterior"])
+    return {
+        "totais": totais.rename(index={"TotalLiq": "total_geral", "servico": "total_servicos"}),
+        "resumo": resumo_categorias(atual, anterior),
+        "anteriores": anteriores,
+        "ate_dia": ate_dia,
+    }
+
+
+def totais_categorias(vendas):
+    """Total geral e total de serviços dos cards de pages/Categorias.py."""
+    return {
+        "total_geral": vendas["TotalLiq"].sum(),
+        "total_servicos": vendas["servico"].sum(),
+    }
+
+
+def categorias(contexto, selecoes):
+    """Todos os quadros de pages/Categorias.py para ``selecoes`` (Empresa, Ano, Mes, Categoria)."""
+    return _pagina("categorias", contexto, selecoes)
+
+
+# Quadros de cada página por seção: a página calcula só as seções que exibe
+# (a aba aberta), e a página inteira é a união delas (lote e benchmarks)
+SECOES = {
+    "parceiros": {
+        "cards": cards,
+        "realizado": lambda contexto, selecoes, vendas: realizado_por_dia(vendas),
+        "metas": metas_x_realizado,
+    },
+    "categorias": {
+        "totais": lambda contexto, selecoes, vendas: totais_categorias(vendas),
+        "resumo": lambda contexto, selecoes, vendas: {"resumo": resumo_categorias(vendas)},
+        "por_dia": lambda contexto, selecoes, vendas: pivots_categorias(vendas),
+        "graficos": lambda contexto, selecoes, vendas: graficos_categorias(vendas),
+    },
+}
+
+
+# Seções que usam a planilha de metas: só nelas a versão das metas entra nas chaves
+SECOES_COM_METAS = {("parceiros", "metas")}
+
+
+def usa_metas(pagina, nome=None):
+    """Se a seção ``nome`` de ``pagina`` (ou alguma seção, sem ``nome``) usa as metas."""
+    return any(p == pagina and (nome is None or s == nome) for p, s in SECOES_COM_METAS)
+
+
+def secao(pagina, nome, contexto, selecoes):
+    """Quadros da seção ``nome`` de ``pagina`` para ``selecoes``."""
+    return SECOES[pagina][nome](contexto, selecoes, contexto.cubo.filtrar(selecoes))
+
+
+def _pagina(pagina, contexto, selecoes):
+    vendas = contexto.cubo.filtrar(selecoes)
+    return {
+        chave: valor
+        for calcular in SECOES[pagina].values()
+        for chave, valor in calcular(contexto, selecoes, vendas).items()
+    }
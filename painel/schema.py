@@ -0,0 +1,68 @@
+"""Schema canônico do DataFrame de contas, aplicado uma única vez na carga.
+
+Depois de ``normalizar`` as páginas usam as colunas como estão, sem ``astype``
+nem cópias: textos repetidos viram categóricos, Ano/Mes/Dia inteiros pequenos,
+``Data`` datetime e os valores float64. O frame é compartilhado entre as
+páginas e deve ser tratado como somente leitura; colunas derivadas são criadas
+com ``assign`` (copy-on-write), nunca no frame carregado.
+"""
+import pandas as pd
+
+if int(pd.__version__.split(".")[0]) < 3:
+    # No pandas 3 o copy-on-write é sempre ativo; antes disso precisa ser ligado
+    pd.set_option("mode.copy_on_write", True)
+
+TIPOS = {
+    "conta": "category",
+    "Empresa": "category",
+    "Categoria": "category",
+    "Ano": "int16",
+    "Mes": "int8",
+    "Dia": "int8",
+    "QTD": "int32",
+    "TotalLiq": "float64",
+    "servico": "float64",
+}
+
+COLUNAS = ["conta", "Empresa", "Categoria", "Ano", "Mes", "Dia", "Data", "QTD", "TotalLiq", "servico"]
+
+MESES = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
+    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
+    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
+}
+
+
+def numeros_meses(nomes):
+    """Converte nomes de mês selecionados na sidebar nos números usados na coluna ``Mes``."""
+    return [numero for numero, nome in MESES.items() if nome in nomes]
+
+
+def _categorico(serie):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.remove_unused_categories()
+    if not pd.api.types.is_string_dtype(serie):
+        # "conta" pode vir numérica da API; as páginas sempre a trataram como texto
+        serie = serie.astype(str)
+    return serie.astype("category")
+
+
+def normalizar(df):
+    """Devolve um novo DataFrame de contas no schema canônico (vazio continua vazio)."""
+    if df.empty:
+        return df
+    colunas = {}
+    for coluna in COLUNAS:
+        serie = df[coluna]
+        tipo = TIPOS.get(coluna)
+        if tipo == "category":
+            colunas[coluna] = _categorico(serie)
+        elif coluna == "Data":
+            colunas[coluna] = pd.to_datetime(serie, errors="coerce")
+        else:
+            serie = pd.to_numeric(serie, errors="coerce").fillna(0)
+            if tipo.startswith("int"):
+                # QTD é contagem de pax; Ano/Mes/Dia também só aceitam inteiros
+                serie = serie.round()
+            colunas[coluna] = serie.astype(tipo)
+    return pd.DataFrame(colunas)
@@ -0,0 +1,309 @@
+"""Snapshot dos dados de contas atualizado em segundo plano e compartilhado entre processos.
+
+Uma thread por processo (``Atualizador``) sincroniza /contas a cada
+``INTERVALO_ATUALIZACAO`` segundos, monta o próximo snapshot ao lado do atual e
+só então troca a referência; quem está rodando a página continua com o snapshot
+que pegou e nenhuma execução espera pela API.
+
+Com vários processos do app no mesmo host, o snapshot é gravado uma vez como
+arquivo Arrow IPC sem compressão em ``DIRETORIO_SNAPSHOTS`` e cada processo o
+mapeia em memória, somente leitura: as colunas numéricas e os códigos dos
+categóricos apontam direto para o arquivo, então a memória física dos dados é
+a mesma para todos. ``ARQUIVO_PONTEIRO`` diz qual arquivo é o vigente e é
+trocado com ``os.replace``; os processos conferem o ponteiro a cada
+``INTERVALO_VERIFICACAO`` segundos e passam a mapear o arquivo novo. Sincronizar
+e publicar acontece com a trava ``ARQUIVO_TRAVA`` (flock): um processo por vez
+escreve no armazenamento, e quem chega logo depois de outro ter sincronizado
+só adota o snapshot dele.
+
+Enquanto o histórico não está completo (``sync.completar_historico``), a mesma
+thread baixa ``MESES_POR_LOTE`` meses por vez e publica um snapshot novo a cada
+lote. Um mês que a página precisa antes disso é baixado na hora (``garantir``).
+Cada snapshot novo publicado pela thread chama ``ao_publicar`` depois de
+soltar a trava (o app usa para completar o lote pré-calculado, ``painel.lote``).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+
+import pandas as pd
+import pyarrow as pa
+import requests
+
+from painel import metricas, schema, sync
+
+try:
+    import fcntl
+except ImportError:
+    # Sem flock (Windows): a trava vale só dentro do processo
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_ATUALIZACAO = int(os.environ.get("PAINEL_INTERVALO_ATUALIZACAO", "300"))
+# Meses do histórico baixados entre uma publicação de snapshot e a seguinte
+MESES_POR_LOTE = int(os.environ.get("PAINEL_MESES_POR_LOTE", "6"))
+# Frequência com que cada processo confere se outro publicou um snapshot novo
+INTERVALO_VERIFICACAO = float(os.environ.get("PAINEL_INTERVALO_VERIFICACAO", "2"))
+
+DIRETORIO_SNAPSHOTS = os.path.join(sync.DIRETORIO_DADOS, "snapshots")
+ARQUIVO_PONTEIRO = os.path.join(sync.DIRETORIO_DADOS, "snapshot.json")
+ARQUIVO_TRAVA = os.path.join(sync.DIRETORIO_DADOS, "snapshot.lock")
+# Arquivos mantidos no disco: os anteriores ao vigente ainda podem estar sendo
+# mapeados por um processo que leu o ponteiro antigo
+ARQUIVOS_MANTIDOS = 3
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    dados: pd.DataFrame
+    # Número sequencial do snapshot publicado (o mesmo em todos os processos)
+    versao: int
+    versao_store: str
+    # Última sincronização bem-sucedida com o backend (time.time()), None se nunca houve
+    sincronizado_em: float | None
+
+    def idade(self):
+        """Segundos desde a última sincronização (None se os dados só vieram do disco)."""
+        if self.sincronizado_em is None:
+            return None
+        return time.time() - self.sincronizado_em
+
+
+@contextmanager
+def trava():
+    """Exclusão entre os processos do host para sincronizar e publicar."""
+    os.makedirs(sync.DIRETORIO_DADOS, exist_ok=True)
+    with open(ARQUIVO_TRAVA, "a") as arquivo:
+        if fcntl is not None:
+            fcntl.flock(arquivo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+
+def ler_ponteiro():
+    """Snapshot vigente publicado (versão, arquivo, versão do armazenamento, sincronização)."""
+    try:
+        with open(ARQUIVO_PONTEIRO, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except FileNotFoundError:
+        return None
+
+
+def _caminho(ponteiro):
+    return os.path.join(DIRETORIO_SNAPSHOTS, ponteiro["arquivo"])
+
+
+def _gravar_arrow(dados, caminho):
+    # Sem compressão, para que os processos possam mapear o arquivo em memória
+    tabela = pa.Table.from_pandas(dados, preserve_index=False)
+    with pa.OSFile(caminho, "wb") as destino, pa.ipc.new_file(destino, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+
+
+def _coluna(coluna):
+    # Números e datas sem nulos viram arrays sobre o mapeamento; nos categóricos
+    # os códigos também, e só o dicionário (valores distintos) é convertido
+    if not pa.types.is_dictionary(coluna.type):
+        return coluna.to_pandas()
+    pedaco = coluna.chunk(0) if coluna.num_chunks == 1 else coluna.combine_chunks()
+    indices = pedaco.indices
+    if indices.null_count:
+        indices = indices.fill_null(-1)
+    categorias = pd.Index(pedaco.dictionary.to_pandas(), copy=False)
+    return pd.Categorical.from_codes(
+        indices.to_numpy(zero_copy_only=False),
+        dtype=pd.CategoricalDtype(categorias, ordered=pedaco.type.ordered),
+        validate=False,
+    )
+
+
+def _mapear(ponteiro):
+    with metricas.secao("snapshot.mapear") as info:
+        with pa.memory_map(_caminho(ponteiro), "r") as fonte:
+            tabela = pa.ipc.open_file(fonte).read_all()
+        dados = pd.DataFrame({nome: _coluna(tabela.column(nome)) for nome in tabela.column_names}, copy=False)
+        info["linhas"] = len(dados)
+    dados.attrs["versao"] = ponteiro["versao"]
+    dados.attrs["versao_store"] = ponteiro["versao_store"]
+    # Versão de cada mês (chave do lote pré-calculado, painel.lote)
+    dados.attrs["versoes_meses"] = ponteiro.get("meses", {})
+    return Snapshot(dados, ponteiro["versao"], ponteiro["versao_store"], ponteiro["sincronizado_em"])
+
+
+def _limpar(vigente):
+    arquivos = sorted(nome for nome in os.listdir(DIRETORIO_SNAPSHOTS) if nome.endswith(".arrow"))
+    for nome in arquivos[:-ARQUIVOS_MANTIDOS]:
+        if nome != vigente:
+            os.remove(os.path.join(DIRETORIO_SNAPSHOTS, nome))
+
+
+def publicar(sincronizado_em=None):
+    """Publica o armazenamento local como snapshot, se ele mudou desde o vigente.
+
+    Deve ser chamada com a ``trava``. Sem mudança no armazenamento só a hora da
+    sincronização é atualizada no ponteiro (``None`` mantém a que está lá).
+    """
+    ponteiro = ler_ponteiro()
+    if sincronizado_em is None and ponteiro is not None:
+        sincronizado_em = ponteiro["sincronizado_em"]
+    versao_store = sync.versao_store()
+    # Ponteiro de antes das versões por mês ("meses") é republicado uma vez
+    vigente = ponteiro is not None and ponteiro["versao_store"] == versao_store and "meses" in ponteiro
+    if vigente and os.path.exists(_caminho(ponteiro)):
+        if ponteiro["sincronizado_em"] != sincronizado_em:
+            ponteiro = {**ponteiro, "sincronizado_em": sincronizado_em}
+            sync._gravar_atomico(ARQUIVO_PONTEIRO, lambda caminho: sync._dump_json(ponteiro, caminho))
+        return ponteiro
+    versao = (ponteiro["versao"] if ponteiro is not None else 0) + 1
+    novo = {
+        "versao": versao,
+        "arquivo": f"{versao:08d}.arrow",
+        "versao_store": versao_store,
+        "meses": sync.versoes_meses(),
+        "sincronizado_em": sincronizado_em,
+    }
+    with metricas.secao("snapshot.gravar") as info:
+        dados = schema.normalizar(sync.ler_store())
+        info["linhas"] = len(dados)
+        os.makedirs(DIRETORIO_SNAPSHOTS, exist_ok=True)
+        sync._gravar_atomico(_caminho(novo), lambda caminho: _gravar_arrow(dados, caminho))
+    sync._gravar_atomico(ARQUIVO_PONTEIRO, lambda caminho: sync._dump_json(novo, caminho))
+    _limpar(novo["arquivo"])
+    return novo
+
+
+class Atualizador:
+    def __init__(self, intervalo=INTERVALO_ATUALIZACAO, ao_publicar=None):
+        self.intervalo = intervalo
+        # Chamada (sem as travas) depois que a thread de fundo publica um
+        # snapshot novo (pré-cálculo do lote, por exemplo)
+        self.ao_publicar = ao_publicar
+        self.erro = None
+        self._parar = threading.Event()
+        self._thread = None
+        # Uma operação de sincronização por vez no processo (thread de fundo ou
+        # página garantindo um mês); entre processos vale a ``trava``
+        self._sincronizando = threading.Lock()
+        self._ponteiro = None
+        self._atual = None
+        self.completo = False
+        # Na partida o snapshot vem do disco, sem rede: o já publicado ou um
+        # novo a partir do armazenamento local, se ele mudou desde então
+        with trava():
+            publicar()
+        self._adotar()
+
+    def atual(self):
+        """Snapshot vigente (leitura de uma referência, nunca bloqueia)."""
+        return self._atual
+
+    def _adotar(self):
+        # Passa para o snapshot publicado (por este ou por outro processo), se mudou
+        ponteiro = ler_ponteiro()
+        if ponteiro is None or ponteiro == self._ponteiro:
+            return
+        if self._ponteiro is not None and ponteiro["arquivo"] == self._ponteiro["arquivo"]:
+            self._atual = replace(self._atual, sincronizado_em=ponteiro["sincronizado_em"])
+        else:
+            self._atual = _mapear(ponteiro)
+        self._ponteiro = ponteiro
+        self.completo = sync.ler_particoes()["completo"]
+
+    def _executar(self, secao, operacao, sincronizacao=False, fundo=True):
+        # Roda ``operacao`` com as travas e publica o resultado; False se o backend falhou.
+        # Com ``sincronizacao``, um resultado verdadeiro marca a hora da sincronização;
+        # ``fundo`` diz que ninguém espera pela operação (chama ``ao_publicar``).
+        try:
+            with self._sincronizando, trava():
+                with metricas.secao(secao):
+                    resultado = operacao()
+                anterior = ler_ponteiro()
+                publicado = publicar(time.time() if sincronizacao and resultado else None)
+                novo = anterior is None or publicado["arquivo"] != anterior["arquivo"]
+        except requests.exceptions.RequestException as e:
+            self.erro = e
+            logger.warning("Falha ao sincronizar /contas: %s", e)
+            return False, None
+        self.erro = None
+        self._adotar()
+        # Já sem as travas: o pré-cálculo não segura a sincronização de ninguém
+        if fundo and novo and self.ao_publicar is not None:
+            self._ao_publicar()
+        return True, resultado
+
+    def _ao_publicar(self):
+        # Falha aqui não é falha de sincronização: o snapshot já foi publicado
+        try:
+            with metricas.secao("snapshot.ao_publicar"):
+                self.ao_publicar()
+        except Exception:
+            logger.exception("Erro depois de publicar o snapshot")
+
+    def _sincronizar(self):
+        # Outro processo pode ter acabado de sincronizar: não repete a chamada ao backend
+        ponteiro = ler_ponteiro()
+        if ponteiro is not None and ponteiro["sincronizado_em"] is not None:
+            if time.time() - ponteiro["sincronizado_em"] < self.intervalo:
+                return False
+        sync.sincronizar()
+        return True
+
+    def atualizar(self):
+        """Sincroniza com o backend e publica um snapshot novo se o armazenamento mudou."""
+        self._executar("snapshot.sincronizar", self._sincronizar, sincronizacao=True)
+
+    def completar(self):
+        """Baixa o histórico que falta em lotes, publicando um snapshot por lote."""
+        while not self.completo and not self._parar.is_set():
+            ok, completo = self._executar("snapshot.completar", lambda: sync.completar_historico(MESES_POR_LOTE))
+            if not ok:
+                return
+            self.completo = completo
+
+    def garantir(self, particoes):
+        """Baixa agora os meses ``(ano, mes)`` que faltam e devolve o snapshot vigente."""
+        # Sem pegar as travas quando não falta nada (o caso comum)
+        if not self.completo and sync.faltantes(particoes):
+            self._executar("snapshot.garantir", lambda: sync.garantir(particoes), fundo=False)
+        return self._atual
+
+    def _rodar(self):
+        proxima = 0.0
+        while not self._parar.is_set():
+            try:
+                self._adotar()
+                if time.monotonic() >= proxima:
+                    proxima = time.monotonic() + self.intervalo
+                    self.atualizar()
+                    self.completar()
+            except Exception:
+                logger.exception("Erro ao montar o snapshot de contas")
+            self._parar.wait(INTERVALO_VERIFICACAO)
+
+    def iniciar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._rodar, name="painel-atualizador", daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+
+
+def descrever_idade(segundos):
+    """Texto curto para a idade do snapshot ("há 3 min")."""
+    if segundos is None:
+        return "ainda não sincronizado"
+    if segundos < 60:
+        return "há menos de 1 min"
+    if segundos < 3600:
+        return f"há {int(segundos // 60)} min"
+    return f"há {int(segundos // 3600)} h {int(segundos % 3600 // 60)} min"
@@ -0,0 +1,328 @@
+"""Sincronização incremental de /contas para um armazenamento local em Parquet.
+
+O histórico fica em ``DIRETORIO_STORE`` com um arquivo por mês (``AAAA-MM.parquet``)
+e a marca d'água (última ``Data``/``conta`` vista) em ``ARQUIVO_MARCA``. A cada
+sincronização só os meses a partir do corte são baixados e reescritos; os meses
+fechados continuam no disco sem tráfego nenhum.
+
+Cada mês é também a partição pedida ao backend (``?ano=&mes=``): a primeira
+sincronização baixa só o mês corrente e o anterior, que é o que as páginas
+abrem por padrão, e o resto do histórico vem depois, um mês por requisição
+(``completar_historico``, para trás a partir dali, ou ``garantir`` para os
+meses que alguém selecionou). Quais meses já foram baixados, inclusive os que
+vieram vazios, fica em ``ARQUIVO_PARTICOES``; nenhum é baixado duas vezes.
+"""
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pandas as pd
+
+from painel import api, ingestao
+
+DIRETORIO_DADOS = os.environ.get("PAINEL_DADOS", "./dados")
+DIRETORIO_STORE = os.path.join(DIRETORIO_DADOS, "contas")
+ARQUIVO_MARCA = os.path.join(DIRETORIO_DADOS, "marca_dagua.json")
+ARQUIVO_PARTICOES = os.path.join(DIRETORIO_DADOS, "particoes.json")
+
+# Dias antes da marca d'água que são baixados de novo a cada sincronização,
+# para capturar contas lançadas com atraso ou ajustadas depois de fechadas.
+JANELA_REVISAO_DIAS = 3
+
+# Meses seguidos sem nenhuma conta que encerram a busca do histórico para trás
+MESES_VAZIOS_FIM = int(os.environ.get("PAINEL_MESES_VAZIOS_FIM", "3"))
+
+COLUNAS_TEXTO = ["conta", "Empresa", "Categoria"]
+COLUNAS_INTEIRAS = ["Ano", "Mes", "Dia"]
+COLUNAS_VALOR = ["QTD", "TotalLiq", "servico"]
+
+
+def _tipar(df):
+    # Tipos estáveis entre os arquivos mensais (o Parquet exige o mesmo schema em todos)
+    df = df.copy()
+    for coluna in COLUNAS_TEXTO:
+        df[coluna] = df[coluna].astype(str)
+    for coluna in COLUNAS_INTEIRAS:
+        df[coluna] = pd.to_numeric(df[coluna], errors="coerce").fillna(0).astype("int64")
+    for coluna in COLUNAS_VALOR:
+        df[coluna] = pd.to_numeric(df[coluna], errors="coerce").fillna(0).astype("float64")
+    df["Data"] = pd.to_datetime(df["Data"], errors="coerce")
+    return df
+
+
+def _buscar(params=None):
+    return api.buscar("/contas", params, ler=ingestao.ler_resposta, stream=True, headers=ingestao.cabecalhos())
+
+
+def ler_marca():
+    if not os.path.exists(ARQUIVO_MARCA):
+        return None
+    with open(ARQUIVO_MARCA, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def _gravar_marca(df):
+    ultima = df.loc[df["Data"].idxmax()]
+    marca = {
+        "data": ultima["Data"].date().isoformat(),
+        "conta": str(ultima["conta"]),
+    }
+    _gravar_atomico(ARQUIVO_MARCA, lambda caminho: _dump_json(marca, caminho))
+    return marca
+
+
+def _dump_json(obj, caminho):
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(obj, arquivo)
+
+
+def _gravar_atomico(destino, escrever):
+    # Escreve num temporário e troca com os.replace, assim um leitor nunca vê arquivo pela metade.
+    # O nome é único por chamada: dois processos do app podem regravar o mesmo destino juntos.
+    descritor, temporario = tempfile.mkstemp(
+        dir=os.path.dirname(destino) or ".", prefix=os.path.basename(destino) + ".", suffix=".tmp"
+    )
+    os.close(descritor)
+    try:
+        # mkstemp cria com 0600; o arquivo final fica legível como os demais
+        os.chmod(temporario, 0o644)
+        escrever(temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+def _arquivo_mes(ano, mes):
+    return os.path.join(DIRETORIO_STORE, f"{ano:04d}-{mes:02d}.parquet")
+
+
+def _gravar_meses(df):
+    os.makedirs(DIRETORIO_STORE, exist_ok=True)
+    for (ano, mes), parte in df.groupby(["Ano", "Mes"], sort=True):
+        _gravar_atomico(_arquivo_mes(ano, mes), lambda caminho, parte=parte: parte.to_parquet(caminho, index=False))
+
+
+def _mesmas_linhas(a, b):
+    # Comparação sem depender da ordem em que o backend devolveu as linhas
+    if len(a) != len(b) or not a.dtypes.equals(b.dtypes):
+        return False
+    colunas = list(a.columns)
+    return a.sort_values(colunas).reset_index(drop=True).equals(b.sort_values(colunas).reset_index(drop=True))
+
+
+def _datas(df):
+    # Data de cada linha para a janela de revisão; sem Data válida (NaT) vale
+    # Ano/Mes/Dia, que o _tipar sempre preenche. NaT só se nem isso formar uma data.
+    partes = pd.DataFrame({"year": df["Ano"], "month": df["Mes"], "day": df["Dia"]})
+    return df["Data"].fillna(pd.to_datetime(partes, errors="coerce"))
+
+
+def _aplicar_delta(novos, corte, ultima_data):
+    # Reescreve só os meses da janela: o que está antes do corte é preservado e o
+    # restante é trocado pelo que veio do backend (inclusive linhas que sumiram lá).
+    # Linhas sem data nenhuma não entram na janela e ficam como estão.
+    os.makedirs(DIRETORIO_STORE, exist_ok=True)
+    ultima_nova = _datas(novos).max()
+    fim = ultima_data if pd.isna(ultima_nova) else max(ultima_nova, ultima_data)
+    for periodo in pd.period_range(pd.Period(corte, freq="M"), pd.Period(fim, freq="M"), freq="M"):
+        destino = _arquivo_mes(periodo.year, periodo.month)
+        partes = []
+        anterior = None
+        if os.path.exists(destino):
+            anterior = pd.read_parquet(destino)
+            partes.append(anterior[~(_datas(anterior) >= corte)])
+        partes.append(novos[(novos["Ano"] == periodo.year) & (novos["Mes"] == periodo.month)])
+        mes = pd.concat(partes, ignore_index=True)
+        if anterior is not None and _mesmas_linhas(mes, anterior):
+            # Nada mudou no mês: manter o arquivo (e a versão do armazenamento)
+            continue
+        if mes.empty:
+            if os.path.exists(destino):
+                os.remove(destino)
+            continue
+        _gravar_atomico(destino, lambda caminho, mes=mes: mes.to_parquet(caminho, index=False))
+
+
+def _chave_mes(ano, mes):
+    return f"{ano:04d}-{mes:02d}"
+
+
+def _mes_anterior(ano, mes):
+    return (ano - 1, 12) if mes == 1 else (ano, mes - 1)
+
+
+def ler_particoes():
+    """Estado das partições: meses baixados, cursor do histórico e se ele está completo."""
+    if os.path.exists(ARQUIVO_PARTICOES):
+        with open(ARQUIVO_PARTICOES, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    # Armazenamento de antes das partições: foi baixado inteiro
+    completo = ler_marca() is not None
+    return {"baixadas": [], "cursor": None, "vazias_seguidas": 0, "completo": completo}
+
+
+def _gravar_particoes(estado):
+    _gravar_atomico(ARQUIVO_PARTICOES, lambda caminho: _dump_json(estado, caminho))
+
+
+def _baixar_particao(estado, ano, mes):
+    # Baixa (ano, mes) e anota no estado; devolve as linhas tipadas
+    df = _buscar({"ano": ano, "mes": mes})
+    if not df.empty:
+        df = _tipar(df)
+        _gravar_meses(df)
+        if ((df["Ano"] != ano) | (df["Mes"] != mes)).any():
+            # O backend ignorou o filtro e mandou o histórico inteiro, que já foi gravado
+            estado["completo"] = True
+    estado["baixadas"] = sorted(set(estado["baixadas"]) | {_chave_mes(ano, mes)})
+    return df
+
+
+def faltantes(particoes, estado=None):
+    """Partições ``(ano, mes)`` de ``particoes`` que ainda não foram baixadas."""
+    estado = estado or ler_particoes()
+    if estado["completo"]:
+        return []
+    baixadas = set(estado["baixadas"])
+    return sorted({(ano, mes) for ano, mes in particoes if _chave_mes(ano, mes) not in baixadas})
+
+
+def garantir(particoes):
+    """Baixa as partições ``(ano, mes)`` que ainda não estão no armazenamento.
+
+    Devolve as que foram baixadas agora (vazia se já estavam todas no disco).
+    """
+    estado = ler_particoes()
+    faltando = faltantes(particoes, estado)
+    for ano, mes in faltando:
+        _baixar_particao(estado, ano, mes)
+        if estado["completo"]:
+            break
+    if faltando:
+        _gravar_particoes(estado)
+    return faltando
+
+
+def completar_historico(meses=6):
+    """Baixa até ``meses`` partições do histórico, do cursor para trás.
+
+    A busca termina depois de ``MESES_VAZIOS_FIM`` meses seguidos sem contas.
+    Devolve ``True`` quando o histórico está completo.
+    """
+    estado = ler_particoes()
+    while not estado["completo"] and meses > 0:
+        ano, mes = estado["cursor"]
+        chave = _chave_mes(ano, mes)
+        if chave in estado["baixadas"]:
+            vazio = not os.path.exists(_arquivo_mes(ano, mes))
+        else:
+            vazio = _baixar_particao(estado, ano, mes).empty
+            meses -= 1
+        estado["vazias_seguidas"] = estado["vazias_seguidas"] + 1 if vazio else 0
+        if estado["vazias_seguidas"] >= MESES_VAZIOS_FIM:
+            estado["completo"] = True
+        estado["cursor"] = _mes_anterior(ano, mes)
+    _gravar_particoes(estado)
+    return estado["completo"]
+
+
+def _primeira_sincronizacao():
+    # Só o mês corrente e o anterior; o restante fica para ``completar_historico``
+    hoje = date.today()
+    recentes = [(hoje.year, hoje.month), _mes_anterior(hoje.year, hoje.month)]
+    estado = {"baixadas": [], "cursor": _mes_anterior(*recentes[-1]), "vazias_seguidas": 0, "completo": False}
+    partes = []
+    for ano, mes in recentes:
+        partes.append(_baixar_particao(estado, ano, mes))
+        if estado["completo"]:
+            break
+    partes = [parte for parte in partes if not parte.empty]
+    recente = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+    if recente.empty:
+        # Nada nos últimos meses: baixa tudo de uma vez, como antes das partições
+        recente = _buscar()
+        if recente.empty:
+            return None
+        recente = _tipar(recente)
+        _gravar_meses(recente)
+        estado["completo"] = True
+    _gravar_particoes(estado)
+    return _gravar_marca(recente)
+
+
+def sincronizar():
+    """Atualiza o armazenamento local e devolve a marca d'água resultante.
+
+    Sem marca d'água (primeira execução) baixa só as partições recentes; depois
+    disso pede ao backend apenas as linhas com ``Data`` a partir do corte
+    (marca d'água menos ``JANELA_REVISAO_DIAS``) e reescreve só os meses afetados.
+    """
+    marca = ler_marca()
+    if marca is None or not os.path.isdir(DIRETORIO_STORE):
+        return _primeira_sincronizacao()
+
+    corte = pd.Timestamp(marca["data"]) - timedelta(days=JANELA_REVISAO_DIAS)
+    novos = _buscar({"desde": corte.date().isoformat(), "conta": marca["conta"]})
+    if not novos.empty:
+        novos = _tipar(novos)
+        # O filtro local garante o resultado mesmo se o backend ignorar o parâmetro "desde"
+        novos = novos[_datas(novos) >= corte]
+    else:
+        novos = _tipar(pd.DataFrame(columns=COLUNAS_TEXTO + COLUNAS_INTEIRAS + COLUNAS_VALOR + ["Data"]))
+
+    _aplicar_delta(novos, corte, pd.Timestamp(marca["data"]))
+    if not novos.empty:
+        # Meses novos que chegaram pelo incremental também contam como baixados
+        estado = ler_particoes()
+        meses = {_chave_mes(ano, mes) for ano, mes in novos[["Ano", "Mes"]].drop_duplicates().itertuples(index=False)}
+        if not meses <= set(estado["baixadas"]):
+            estado["baixadas"] = sorted(set(estado["baixadas"]) | meses)
+            _gravar_particoes(estado)
+    # A marca d'água só avança com datas válidas
+    if not novos["Data"].max() >= pd.Timestamp(marca["data"]):
+        return marca
+    return _gravar_marca(novos)
+
+
+def ler_store(colunas=None, meses=None):
+    """Lê o histórico completo do armazenamento local (DataFrame vazio se não houver).
+
+    ``colunas`` limita a leitura a essas colunas (o Parquet lê só elas do disco)
+    e ``meses`` (``(ano, mes)``) aos arquivos desses meses.
+    """
+    if not os.path.isdir(DIRETORIO_STORE):
+        return pd.DataFrame()
+    if meses is None:
+        arquivos = sorted(
+            os.path.join(DIRETORIO_STORE, nome)
+            for nome in os.listdir(DIRETORIO_STORE)
+            if nome.endswith(".parquet")
+        )
+    else:
+        # Meses sem contas não têm arquivo
+        arquivos = sorted(_arquivo_mes(ano, mes) for ano, mes in meses)
+        arquivos = [arquivo for arquivo in arquivos if os.path.exists(arquivo)]
+    if not arquivos:
+        return pd.DataFrame()
+    return pd.concat([pd.read_parquet(arquivo, columns=colunas) for arquivo in arquivos], ignore_index=True)
+
+
+def versoes_meses():
+    """Versão de cada mês do armazenamento (``"AAAA-MM"`` -> mtime do arquivo, em ns)."""
+    if not os.path.isdir(DIRETORIO_STORE):
+        return {}
+    return {
+        entrada.name[: -len(".parquet")]: entrada.stat().st_mtime_ns
+        for entrada in os.scandir(DIRETORIO_STORE)
+        if entrada.name.endswith(".parquet")
+    }
+
+
+def versao_store():
+    """Identificador da versão atual do armazenamento (muda a cada mês reescrito)."""
+    if not os.path.isdir(DIRETORIO_STORE):
+        return "vazio"
+    versoes = versoes_meses()
+    return f"{len(versoes)}-{max(versoes.values(), default=0)}"
@@ -0,0 +1,116 @@
+"""Exibição de tabelas numéricas sem transformá-las em texto.
+
+As tabelas seguem numéricas até o navegador (a ordenação pelo cabeçalho é
+pelo valor), com o texto pt_BR de ``painel.formatacao`` ("R$ 1.234,56")
+levado no ``Styler``: o ``format`` do ``column_config`` usaria o locale do
+navegador e não tem o símbolo do real. As cores saem de uma única conta
+vetorizada sobre os valores, em vez de ``Styler.map`` célula a célula sobre
+texto.
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from painel import formatacao
+
+# Limiares do % de alcance da meta (>= 100 verde, 95 a 100 laranja, abaixo vermelho)
+LIMIARES = [(100, "green"), (95, "orange")]
+ABAIXO = "red"
+DESTAQUE = "color: #8A4CCC; font-weight: bold;"
+
+FORMATADORES = {
+    "milhar": formatacao.milhar,
+    "moeda": formatacao.moeda,
+    "percentual": partial(formatacao.percentual, casas=0),
+}
+
+
+def coluna(formato, rotulo=None):
+    """``NumberColumn`` para ``formato``: "milhar", "moeda" ou "percentual".
+
+    Sem ``format`` declarado: o texto exibido é o do ``Styler`` (``formatar``).
+    """
+    if formato not in FORMATADORES:
+        raise ValueError(f"formato desconhecido: {formato}")
+    return st.column_config.NumberColumn(rotulo, step=0.01 if formato == "moeda" else 1)
+
+
+def formatar(estilo, formatos):
+    """``Styler`` com o texto pt_BR de cada coluna numérica; os valores seguem numéricos.
+
+    ``formatos`` é um formato para todas as colunas ou uma função ``coluna ->
+    formato`` (``None`` deixa a coluna como está). Cada coluna é formatada de
+    uma vez (``painel.formatacao``) e o ``Styler`` só consulta o texto do valor.
+    """
+    tabela = estilo.data
+    formatadores = {}
+    for posicao, nome in enumerate(tabela.columns):
+        formato = formatos(nome) if callable(formatos) else formatos
+        if formato is None:
+            continue
+        valores = tabela.iloc[:, posicao]
+        textos = dict(zip(valores.to_numpy(), FORMATADORES[formato](valores).to_numpy()))
+        formatadores[nome] = textos.__getitem__
+    # Ausentes (zeros tirados por ``sem_zeros``) ficam com a célula vazia
+    return estilo.format(formatadores, na_rep="")
+
+
+def configuracao(tabela, formatos):
+    """``column_config`` posicional (funciona também com colunas MultiIndex).
+
+    ``formatos`` é um formato para todas as colunas ou uma função
+    ``coluna -> formato``; as posições contam os níveis do índice primeiro.
+    """
+    niveis = tabela.index.nlevels
+    return {
+        niveis + posicao: coluna(formatos(nome) if callable(formatos) else formatos)
+        for posicao, nome in enumerate(tabela.columns)
+    }
+
+
+def sem_zeros(tabela):
+    """Zeros e infinitos viram ausentes (célula vazia), como o "-" das tabelas em texto."""
+    return tabela.where(np.isfinite(tabela) & (tabela != 0))
+
+
+def _cores_limiar(valores):
+    cores = np.select(
+        [valores >= limite for limite, _ in LIMIARES],
+        [f"color: {cor};" for _, cor in LIMIARES],
+        f"color: {ABAIXO};",
+    )
+    # Sem valor (meta zerada) fica sem cor
+    return np.where(np.isnan(valores), "", cores)
+
+
+def estilo_limiar(tabela, colunas):
+    """``Styler`` que colore ``colunas`` pelos limiares, calculado de uma vez."""
+    def cores(quadro):
+        css = np.full(quadro.shape, "", dtype=object)
+        posicoes = [quadro.columns.get_loc(nome) for nome in colunas]
+        css[:, posicoes] = _cores_limiar(quadro.iloc[:, posicoes].to_numpy(dtype=np.float64))
+        return pd.DataFrame(css, index=quadro.index, columns=quadro.columns)
+
+    return tabela.style.apply(cores, axis=None)
+
+
+def estilo_totais(tabela, nome="Total"):
+    """``Styler`` que destaca a linha e a coluna ``nome``."""
+    def cores(quadro):
+        css = np.full(quadro.shape, "", dtype=object)
+        css[quadro.index == nome, :] = DESTAQUE
+        css[:, quadro.columns == nome] = DESTAQUE
+        return pd.DataFrame(css, index=quadro.index, columns=quadro.columns)
+
+    return tabela.style.apply(cores, axis=None)
+
+
+def exibir(tabela, formatos, estilo=None, **opcoes):
+    """``st.dataframe`` da tabela numérica, com texto pt_BR e cor opcional."""
+    return st.dataframe(
+        formatar(estilo(tabela) if estilo is not None else tabela.style, formatos),
+        column_config=configuracao(tabela, formatos),
+        **opcoes,
+    )
@@ -0,0 +1,48 @@
+import http.server
+import os
+import threading
+
+import pytest
+
+from painel import api, lote, metas, metricas, snapshot, sync
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def dados(tmp_path, monkeypatch):
+    """Armazenamento, snapshots e métricas num diretório temporário."""
+    monkeypatch.setattr(sync, "DIRETORIO_DADOS", str(tmp_path))
+    monkeypatch.setattr(sync, "DIRETORIO_STORE", str(tmp_path / "contas"))
+    monkeypatch.setattr(sync, "ARQUIVO_MARCA", str(tmp_path / "marca_dagua.json"))
+    monkeypatch.setattr(sync, "ARQUIVO_PARTICOES", str(tmp_path / "particoes.json"))
+    monkeypatch.setattr(snapshot, "DIRETORIO_SNAPSHOTS", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(snapshot, "ARQUIVO_PONTEIRO", str(tmp_path / "snapshot.json"))
+    monkeypatch.setattr(snapshot, "ARQUIVO_TRAVA", str(tmp_path / "snapshot.lock"))
+    monkeypatch.setattr(metricas, "ARQUIVO_METRICAS", str(tmp_path / "metricas.jsonl"))
+    monkeypatch.setattr(lote, "DIRETORIO_LOTE", str(tmp_path / "relatorios"))
+    monkeypatch.setattr(metas, "ARQUIVO_METAS", os.path.join(RAIZ, "Metas_Ajustadas_Sem_Domingos_Gatzz.xlsx"))
+    monkeypatch.setattr(metas, "ARQUIVO_CACHE", str(tmp_path / "metas.arrow"))
+    monkeypatch.setattr(metas, "ARQUIVO_IMPRESSAO", str(tmp_path / "metas.json"))
+    return tmp_path
+
+
+@pytest.fixture
+def servidor(monkeypatch):
+    """Servidor HTTP local; ``servidor.responder = funcao(handler)`` define a resposta de cada GET."""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            estado.requisicoes.append(self.path)
+            estado.responder(self)
+
+        def log_message(self, *args):
+            pass
+
+    estado = type("Servidor", (), {"requisicoes": [], "responder": None})()
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(api, "URL_BASE", f"http://127.0.0.1:{httpd.server_address[1]}")
+    yield estado
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,24 @@
+from datetime import date
+
+import pytest
+
+from bench import gerador
+from painel import dados, metas, schema
+
+
+@pytest.fixture
+def data():
+    data = schema.normalizar(gerador.gerar_contas(5000, anos=1, n_empresas=2, fim=date(2026, 10, 17)))
+    data.attrs["versao"] = 1
+    return data
+
+
+def test_secoes_sem_metas_nao_leem_a_planilha(data, monkeypatch):
+    def versao():
+        raise AssertionError("metas.versao() chamada numa seção sem metas")
+
+    monkeypatch.setattr(metas, "versao", versao)
+    selecoes = {"Empresa": None, "Ano": [2026], "Mes": [10], "Categoria": None}
+    for secao in ["totais", "resumo", "por_dia"]:
+        dados.relatorio("categorias", data, selecoes, secao=secao)
+    dados.relatorio("parceiros", data, {"Empresa": None, "Ano": [2026], "Mes": [10], "Dia": None}, secao="realizado")
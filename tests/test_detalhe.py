@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from painel import detalhe
+
+
+def test_parametros_ida_e_volta():
+    selecoes = {"Empresa": ["A", "B"], "Ano": [2026], "Mes": [9, 10], "Dia": None, "Categoria": ["Tche"]}
+    assert detalhe.ler_parametros(detalhe.parametros(selecoes)) == {
+        "Empresa": ["A", "B"], "Ano": [2026], "Mes": [9, 10], "Categoria": ["Tche"],
+    }
+
+
+def test_parametros_invalidos_sao_ignorados():
+    selecoes = detalhe.ler_parametros({"ano": "abc", "mes": "10,x,", "dia": " 5", "empresa": "A"})
+    assert selecoes == {"Mes": [10], "Dia": [5], "Empresa": ["A"]}
+
+
+def test_paginas_com_muitos_empates_nao_repetem_linhas():
+    # Poucas datas distintas: quase toda página corta no meio de um empate
+    rng = np.random.default_rng(0)
+    linhas = 1000
+    data = pd.DataFrame({
+        "conta": pd.Categorical([str(i) for i in range(linhas)]),
+        "Data": pd.Timestamp("2026-10-01") + pd.to_timedelta(rng.integers(0, 5, linhas), unit="D"),
+        "Empresa": pd.Categorical(["A"] * linhas),
+        "Categoria": pd.Categorical(["X"] * linhas),
+        "QTD": 1.0, "TotalLiq": 1.0, "servico": 0.0,
+    })
+    encontradas = np.arange(linhas)
+    vistas = []
+    for pagina in range(1, 21):
+        pagina_linhas, _ = detalhe.consultar(data, encontradas, ordem="Data", crescente=False, pagina=pagina, tamanho=50)
+        vistas += pagina_linhas["conta"].tolist()
+    assert len(set(vistas)) == linhas
+    esperadas = data.iloc[detalhe.ordenar(data, encontradas, "Data", crescente=False)]["conta"].tolist()
+    assert vistas == esperadas
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+import requests
+
+from painel import snapshot, sync
+
+
+def _truncado(handler):
+    # Promete o corpo inteiro e corta a conexão na metade
+    corpo = json.dumps([
+        {"conta": str(i), "Empresa": "A", "Categoria": "X", "Ano": 2026, "Mes": 10, "Dia": 1,
+         "Data": "2026-10-01", "QTD": 1, "TotalLiq": 10.0, "servico": 0}
+        for i in range(200)
+    ]).encode()
+    handler.send_response(200)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(corpo)))
+    handler.end_headers()
+    handler.wfile.write(corpo[: len(corpo) // 2])
+    handler.wfile.flush()
+    handler.close_connection = True
+
+
+def test_corpo_truncado_vira_erro_do_requests(servidor):
+    servidor.responder = _truncado
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        sync._buscar({"ano": 2026, "mes": 10})
+
+
+def test_garantir_com_corpo_truncado_registra_o_erro(servidor):
+    servidor.responder = _truncado
+    atualizador = snapshot.Atualizador()
+    assert atualizador.garantir([(2026, 10)]) is atualizador.atual()
+    assert isinstance(atualizador.erro, requests.exceptions.RequestException)
+    assert sync.faltantes([(2026, 10)]) == [(2026, 10)]
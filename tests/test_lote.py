@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from bench import gerador
+from painel import lote, metricas, snapshot, sync
+
+HOJE = date(2026, 10, 17)
+
+
+def _selecoes(mes):
+    return {"Empresa": None, "Ano": [2026], "Mes": [mes], "Categoria": None}
+
+
+def _sincronizar_mes_corrente():
+    # O que uma sincronização faz: reescreve o arquivo do mês corrente com a conta nova
+    corrente = pd.read_parquet(sync._arquivo_mes(2026, 10))
+    nova = corrente.tail(1).assign(conta="nova", TotalLiq=99.0)
+    sync._gravar_meses(pd.concat([corrente, nova], ignore_index=True))
+    return True
+
+
+def _lote(atualizador, mes):
+    dados = atualizador.atual().dados
+    return lote.carregar(dados.attrs["versoes_meses"], "categorias", "resumo", _selecoes(mes))
+
+
+def _gravar_store():
+    contas = gerador.gerar_contas(4000, anos=1, n_empresas=2, fim=HOJE)
+    gerador.gravar_store(contas[contas["Data"] >= "2026-09-01"], sync.DIRETORIO_STORE)
+
+
+def _preparar():
+    _gravar_store()
+    lote.precalcular(1, hoje=HOJE)
+
+
+def test_mes_anterior_continua_no_lote_depois_de_sincronizar_o_mes_corrente():
+    _preparar()
+    atualizador = snapshot.Atualizador()
+    assert _lote(atualizador, 9) is not None and _lote(atualizador, 10) is not None
+
+    atualizador._executar("teste", _sincronizar_mes_corrente, sincronizacao=True)
+    assert _lote(atualizador, 9) is not None
+    assert _lote(atualizador, 10) is None
+
+
+def test_atualizador_recalcula_so_o_mes_reescrito():
+    _preparar()
+    gravados = []
+    atualizador = snapshot.Atualizador(ao_publicar=lambda: gravados.extend(lote.precalcular(1, hoje=HOJE)))
+
+    atualizador._executar("teste", _sincronizar_mes_corrente, sincronizacao=True)
+    assert gravados and all("2026-10-" in caminho for caminho in gravados)
+    assert _lote(atualizador, 9) is not None
+    dados = atualizador.atual().dados
+    total = dados.loc[(dados["Ano"] == 2026) & (dados["Mes"] == 10), "TotalLiq"].sum()
+    assert _lote(atualizador, 10)["resumo"]["Total"].iloc[-1] == pytest.approx(total)
+
+
+def test_precalcular_com_outras_threads_usando_as_metricas():
+    # No app, reruns de página seguram a trava de painel.metricas o tempo todo
+    _gravar_store()
+    parar = threading.Event()
+
+    def rerun():
+        while not parar.is_set():
+            metricas.cache("teste", True)
+
+    threads = [threading.Thread(target=rerun, daemon=True) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        with ThreadPoolExecutor(1) as executor:
+            gravados = executor.submit(lote.precalcular, 4, HOJE).result(timeout=60)
+    finally:
+        parar.set()
+    assert gravados
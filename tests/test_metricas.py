@@ -0,0 +1,12 @@
+import os
+
+from painel import metricas
+
+
+def test_arquivo_rotaciona_ao_passar_do_tamanho_maximo(dados, monkeypatch):
+    monkeypatch.setattr(metricas, "TAMANHO_MAX_ARQUIVO", 1000)
+    for _ in range(100):
+        metricas.registrar({"secao": "teste", "ms": 1.0})
+    assert os.path.getsize(metricas.ARQUIVO_METRICAS) <= 1000
+    assert os.path.getsize(metricas.ARQUIVO_METRICAS + ".1") <= 1100
+    assert len(metricas.ler_arquivo()) < 100
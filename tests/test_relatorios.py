@@ -0,0 +1,60 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from bench import gerador
+from painel import relatorios, schema
+from painel.cubo import Cubo
+from painel.indice import IndiceFiltro
+
+HOJE = date(2026, 10, 17)
+
+
+@pytest.fixture(scope="module")
+def contexto():
+    data = schema.normalizar(gerador.gerar_contas(50_000, anos=2, fim=HOJE))
+    return relatorios.Contexto(data, Cubo(data), IndiceFiltro(data, relatorios.COLUNAS_FILTRO))
+
+
+def _total(data, inicio, fim):
+    datas = data["Data"]
+    return data.loc[(datas >= pd.Timestamp(inicio)) & (datas <= pd.Timestamp(fim)), "TotalLiq"].sum()
+
+
+def test_mes_corrente_compara_os_mesmos_dias_do_mes_anterior(contexto):
+    selecoes = {"Empresa": None, "Ano": [2026], "Mes": [10], "Categoria": None}
+    resultado = relatorios.comparacao_categorias(contexto, selecoes, "mes", hoje=HOJE)
+    totais = resultado["totais"]
+    assert resultado["ate_dia"] == 17
+    assert totais.loc["total_geral", "atual"] == pytest.approx(_total(contexto.data, "2026-10-01", "2026-10-17"))
+    assert totais.loc["total_geral", "anterior"] == pytest.approx(_total(contexto.data, "2026-09-01", "2026-09-17"))
+
+
+def test_ano_corrente_compara_ate_o_mesmo_dia_do_ano_anterior(contexto):
+    selecoes = {"Empresa": None, "Ano": [2026], "Mes": None, "Categoria": None}
+    resultado = relatorios.comparacao_categorias(contexto, selecoes, "ano", hoje=HOJE)
+    totais = resultado["totais"]
+    assert totais.loc["total_geral", "atual"] == pytest.approx(_total(contexto.data, "2026-01-01", "2026-10-17"))
+    assert totais.loc["total_geral", "anterior"] == pytest.approx(_total(contexto.data, "2025-01-01", "2025-10-17"))
+
+
+def test_mes_fechado_compara_meses_inteiros(contexto):
+    selecoes = {"Empresa": None, "Ano": [2026], "Mes": [8], "Categoria": None}
+    resultado = relatorios.comparacao_categorias(contexto, selecoes, "mes", hoje=HOJE)
+    assert resultado["ate_dia"] is None
+    assert resultado["totais"].loc["total_geral", "anterior"] == pytest.approx(
+        _total(contexto.data, "2026-07-01", "2026-07-31")
+    )
+
+
+def test_todos_os_meses_so_oferece_ano_anterior():
+    assert relatorios.comparacoes({"Ano": [2026], "Mes": None}) == ["Ano anterior"]
+    assert relatorios.comparacoes({"Ano": [2026], "Mes": [10]}) == list(relatorios.COMPARACOES)
+
+
+def test_selecoes_vazias_nao_viram_periodos(contexto):
+    assert relatorios.periodos({"Ano": [2026], "Mes": []}) == []
+    assert relatorios.periodos_anteriores([], "mes") == []
+    resultado = relatorios.comparacao_categorias(contexto, {"Ano": [], "Mes": [10]}, "mes", hoje=HOJE)
+    assert resultado["totais"]["atual"].sum() == 0
@@ -0,0 +1,62 @@
+import os
+
+import pandas as pd
+import pytest
+
+from painel import sync
+
+
+def _contas(linhas):
+    return sync._tipar(pd.DataFrame(linhas, columns=sync.COLUNAS_TEXTO + sync.COLUNAS_INTEIRAS + sync.COLUNAS_VALOR + ["Data"]))
+
+
+def _linha(conta, dia, data="auto", total=10.0):
+    data = f"2026-10-{dia:02d}" if data == "auto" else data
+    return [conta, "A", "X", 2026, 10, dia, 1, total, 0.0, data]
+
+
+def test_delta_mantem_linhas_com_data_invalida():
+    # Uma linha sem Data antes do corte e outra dentro da janela de revisão
+    sync._gravar_meses(_contas([
+        _linha("1", 2), _linha("2", 3, data=None), _linha("3", 15), _linha("4", 16, data="lixo"),
+    ]))
+    corte = pd.Timestamp("2026-10-14")
+
+    # O backend reenvia a janela: a conta 4 com a data corrigida e valor novo
+    sync._aplicar_delta(_contas([_linha("3", 15), _linha("4", 16, total=20.0)]), corte, pd.Timestamp("2026-10-16"))
+
+    mes = pd.read_parquet(sync._arquivo_mes(2026, 10)).sort_values("conta")
+    assert mes["conta"].tolist() == ["1", "2", "3", "4"]
+    assert mes.loc[mes["conta"] == "4", "TotalLiq"].item() == 20.0
+
+
+def test_delta_sem_data_dentro_da_janela_vindo_do_backend():
+    sync._gravar_meses(_contas([_linha("1", 2), _linha("2", 15)]))
+    corte = pd.Timestamp("2026-10-14")
+    novos = _contas([_linha("2", 15), _linha("3", 16, data=None)])
+    # O mesmo filtro de sincronizar(): a conta 3 entra pela data de Ano/Mes/Dia
+    sync._aplicar_delta(novos[sync._datas(novos) >= corte], corte, pd.Timestamp("2026-10-15"))
+    assert sorted(pd.read_parquet(sync._arquivo_mes(2026, 10))["conta"]) == ["1", "2", "3"]
+
+
+def test_gravar_atomico_usa_temporario_proprio(tmp_path):
+    destino = str(tmp_path / "marca.json")
+    temporarios = []
+
+    def escrever(caminho):
+        temporarios.append(caminho)
+        sync._dump_json({"ok": True}, caminho)
+
+    sync._gravar_atomico(destino, escrever)
+    sync._gravar_atomico(destino, escrever)
+    assert temporarios[0] != temporarios[1]
+    assert os.listdir(tmp_path) == ["marca.json"]
+
+
+def test_gravar_atomico_remove_temporario_com_erro(tmp_path):
+    def falhar(caminho):
+        raise OSError("disco cheio")
+
+    with pytest.raises(OSError):
+        sync._gravar_atomico(str(tmp_path / "marca.json"), falhar)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from painel import tabelas
+
+
+def _exibido(estilo):
+    estilo._compute()
+    return [[celula["display_value"] for celula in linha[1:]] for linha in estilo._translate(False, False)["body"]]
+
+
+def test_moeda_e_milhar_em_pt_br_com_valores_numericos():
+    tabela = pd.DataFrame({"Qtd": [1234.0, 5.0], "Valor": [1234.5, np.nan]}, index=["A", "Total"])
+    estilo = tabelas.formatar(tabela.style, {"Qtd": "milhar", "Valor": "moeda"}.get)
+    assert _exibido(estilo) == [["1.234", "R$\xa01.234,50"], ["5", ""]]
+    assert estilo.data["Valor"].dtype == np.float64
+
+
+def test_formato_unico_em_colunas_multiindex():
+    colunas = pd.MultiIndex.from_tuples([("1-7", "Meta"), ("1-7", "%")])
+    tabela = pd.DataFrame([[2500.0, 97.4]], columns=colunas)
+    estilo = tabelas.formatar(tabela.style, lambda nome: "percentual" if nome[1] == "%" else "milhar")
+    assert _exibido(estilo) == [["2.500", "97%"]]